@@ -4,6 +4,27 @@ import shutil
 FOR_UNDO_HISTORY: list[list] = []
 HISTORY_PATH: str = os.path.join(os.path.expanduser('~'), '.history')
 TRASH_PATH: str = os.path.join(os.path.expanduser('~'), '.trash')
+INDEX_PATH: str = os.path.join(os.path.expanduser('~'), '.grep_index')
+INDEX_PARALLEL_MIN: int = 64
+POOL_CHUNKSIZE: int = 16
+CHUNK_SIZE: int = 64 * 1024
+SNIFF_SIZE: int = 8 * 1024
+OUTPUT_BUFFER_SIZE: int = 256 * 1024
+OUTPUT_FLUSH_INTERVAL: float = 0.1
+LISTING_CACHE_SIZE: int = 500_000
+LISTING_CACHE_MIN_AGE: int = 2 * 10**9
+DU_WORKERS: int = 16
+DEFAULT_LINES: int = 10
+TAIL_FOLLOW_INTERVAL: float = 0.5
+WC_CHUNK_SIZE: int = 1024 * 1024
+COPY_BUFFER_SIZE: int = 1024 * 1024
+COPY_RANGE_SIZE: int = 1024 * 1024 * 1024
+COPY_WORKERS: int = 8
+MTIME_TOLERANCE_NS: int = 2 * 10**9
+PROGRESS_INTERVAL: float = 0.2
+PROGRESS_RANGE_SIZE: int = 16 * 1024 * 1024
+FICLONE: int = 0x40049409
+VERIFY_ALGORITHM: str = 'blake2b'
 
 
 def init_env() -> None:
@@ -0,0 +1,495 @@
+import hashlib
+import os
+import shutil
+import stat
+import sys
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config.consts import (
+    CHUNK_SIZE,
+    COPY_BUFFER_SIZE,
+    COPY_RANGE_SIZE,
+    COPY_WORKERS,
+    FICLONE,
+    MTIME_TOLERANCE_NS,
+    PROGRESS_RANGE_SIZE,
+    VERIFY_ALGORITHM,
+)
+from src.config.exceptions import ChecksumMismatch
+from src.config.functions import scan_tree
+from src.config.progress import Progress
+
+if sys.platform == 'linux':
+    import fcntl
+
+ProgressCallback = Callable[[int], None] | None
+DigestUpdate = Callable[[memoryview], None] | None
+
+
+def range_size(progress: ProgressCallback) -> int:
+    """
+    Возвращает размер одного вызова копирования ядром.
+
+    С прогрессом данные копируются кусками поменьше, чтобы строка
+    прогресса обновлялась во время копирования больших файлов.
+
+    Args:
+        progress: Функция учёта скопированных байт или None.
+
+    Returns:
+        Максимальное число байт за один системный вызов.
+    """
+    return COPY_RANGE_SIZE if progress is None else PROGRESS_RANGE_SIZE
+
+
+def copy_range(
+    in_fd: int, out_fd: int, progress: ProgressCallback = None
+) -> int:
+    """
+    Копирует данные функцией ядра os.copy_file_range.
+
+    На одной файловой системе данные не проходят через процесс (а на
+    CoW-системах блоки могут не копироваться вовсе).
+
+    Args:
+        in_fd: Дескриптор источника (с текущей позиции).
+        out_fd: Дескриптор назначения (с текущей позиции).
+        progress: Функция учёта скопированных байт.
+
+    Returns:
+        Число скопированных байт.
+
+    Raises:
+        OSError: Если вызов не поддерживается для этих файлов.
+    """
+    copied = 0
+    count = range_size(progress)
+    while sent := os.copy_file_range(in_fd, out_fd, count):
+        copied += sent
+        if progress is not None:
+            progress(sent)
+    return copied
+
+
+def send_range(
+    in_fd: int, out_fd: int, progress: ProgressCallback = None
+) -> int:
+    """
+    Копирует данные функцией ядра os.sendfile.
+
+    Args:
+        in_fd: Дескриптор источника (с текущей позиции).
+        out_fd: Дескриптор назначения (с текущей позиции).
+        progress: Функция учёта скопированных байт.
+
+    Returns:
+        Число скопированных байт.
+
+    Raises:
+        OSError: Если вызов не поддерживается для этих файлов.
+    """
+    copied = 0
+    count = range_size(progress)
+    while sent := os.sendfile(out_fd, in_fd, None, count):
+        copied += sent
+        if progress is not None:
+            progress(sent)
+    return copied
+
+
+def read_range(
+    in_fd: int,
+    out_fd: int,
+    progress: ProgressCallback = None,
+    digest: DigestUpdate = None,
+) -> int:
+    """
+    Копирует данные через буфер процесса.
+
+    Один bytearray размером COPY_BUFFER_SIZE переиспользуется для всех
+    чтений (readinto), новые объекты bytes на каждый блок не создаются.
+    Используются только переносимые вызовы, поэтому этот способ работает
+    везде, в том числе в Windows.
+
+    Args:
+        in_fd: Дескриптор источника (с текущей позиции).
+        out_fd: Дескриптор назначения (с текущей позиции).
+        progress: Функция учёта скопированных байт.
+        digest: Метод update хеша; получает каждый прочитанный блок.
+
+    Returns:
+        Число скопированных байт.
+    """
+    buffer = bytearray(COPY_BUFFER_SIZE)
+    view = memoryview(buffer)
+    copied = 0
+    with open(in_fd, 'rb', buffering=0, closefd=False) as fsrc:
+        while read := fsrc.readinto(buffer):
+            written = 0
+            if digest is not None:
+                digest(view[:read])
+            while written < read:
+                written += os.write(out_fd, view[written:read])
+            copied += read
+            if progress is not None:
+                progress(read)
+    return copied
+
+
+KERNEL_COPY_METHODS = (
+    ('copy_file_range', copy_range),
+    ('sendfile', send_range),
+)
+
+
+def copy_data(
+    in_fd: int, out_fd: int, progress: ProgressCallback = None
+) -> str:
+    """
+    Копирует содержимое файла самым быстрым доступным способом.
+
+    Способы пробуются по порядку: os.copy_file_range, os.sendfile, цикл
+    чтения в переиспользуемый буфер. Следующий способ используется, если
+    предыдущий недоступен в системе, вернул ошибку до копирования первого
+    байта или ничего не скопировал из непустого файла (так ведут себя
+    некоторые виртуальные файловые системы).
+
+    Args:
+        in_fd: Дескриптор источника.
+        out_fd: Дескриптор назначения.
+        progress: Функция учёта скопированных байт.
+
+    Returns:
+        Название использованного способа.
+
+    Raises:
+        OSError: Если копирование прервалось ошибкой после начала.
+    """
+    size = os.fstat(in_fd).st_size
+    for name, method in KERNEL_COPY_METHODS:
+        if not hasattr(os, name):
+            continue
+        try:
+            copied = method(in_fd, out_fd, progress)
+        except OSError:
+            if os.lseek(in_fd, 0, os.SEEK_CUR):
+                raise
+            continue
+        if copied or not size:
+            return name
+    read_range(in_fd, out_fd, progress)
+    return 'readinto'
+
+
+def clone_data(in_fd: int, out_fd: int) -> bool:
+    """
+    Делает файл назначения reflink-копией исходного (ioctl FICLONE).
+
+    Данные не копируются: файлы разделяют блоки на диске, пока один из
+    них не изменится. Работает на btrfs, XFS и других файловых системах
+    с поддержкой reflink, если оба файла на одной из них.
+
+    Args:
+        in_fd: Дескриптор исходного файла.
+        out_fd: Дескриптор пустого файла назначения.
+
+    Returns:
+        True, если копия создана; False, если reflink не поддерживается.
+    """
+    if sys.platform != 'linux':
+        return False
+    try:
+        fcntl.ioctl(out_fd, FICLONE, in_fd)
+    except OSError:
+        return False
+    return True
+
+
+def file_digest(fd: int) -> bytes:
+    """
+    Читает файл назначения с диска и считает его хеш.
+
+    Перед чтением данные сбрасываются на диск (os.fsync), а страницы
+    файла вытесняются из кэша (POSIX_FADV_DONTNEED, если доступно),
+    поэтому проверяется записанное на носитель, а не кэш в памяти.
+
+    Args:
+        fd: Дескриптор файла, открытого на чтение и запись.
+
+    Returns:
+        Хеш VERIFY_ALGORITHM содержимого файла.
+    """
+    os.fsync(fd)
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    digest = hashlib.new(VERIFY_ALGORITHM)
+    buffer = bytearray(COPY_BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(fd, 'rb', buffering=0, closefd=False) as f:
+        f.seek(0)
+        while read := f.readinto(buffer):
+            digest.update(view[:read])
+    return digest.digest()
+
+
+def check_digest(src: str, dst: str, fd: int, expected: bytes) -> None:
+    """
+    Сравнивает хеш файла назначения с хешем, посчитанным при копировании.
+
+    Args:
+        src: Путь к исходному файлу.
+        dst: Путь к файлу назначения.
+        fd: Дескриптор файла назначения (чтение и запись).
+        expected: Хеш данных, прочитанных из исходного файла.
+
+    Raises:
+        ChecksumMismatch: Если хеши различаются.
+    """
+    if file_digest(fd) != expected:
+        raise ChecksumMismatch(
+            f'Копия {dst} не совпадает с {src}: контрольные суммы различаются'
+        )
+
+
+def copy_file(
+    src: str,
+    dst: str,
+    metadata: bool = False,
+    progress: ProgressCallback = None,
+    reflink: bool = False,
+    verify: bool = False,
+) -> str:
+    """
+    Копирует файл через copy_data и переносит права доступа.
+
+    С reflink сначала пробует clone_data и копирует данные, только если
+    reflink не поддерживается. С verify данные копируются через буфер
+    процесса (read_range), по тем же блокам считается хеш источника, а
+    затем он сравнивается с хешем файла назначения, прочитанного с
+    диска; источник второй раз не читается.
+
+    Args:
+        src: Путь к исходному файлу.
+        dst: Путь к создаваемому файлу.
+        metadata: Перенести также время доступа/изменения и флаги
+            (как shutil.copy2), а не только права (как shutil.copy).
+        progress: Функция учёта скопированных байт.
+        reflink: Пробовать reflink-копию.
+        verify: Проверить копию по контрольной сумме.
+
+    Returns:
+        Название использованного способа копирования.
+
+    Raises:
+        ChecksumMismatch: Если копия не совпала с источником (verify).
+    """
+    with open(src, 'rb', buffering=0) as fsrc:
+        with open(dst, 'w+b' if verify else 'wb', buffering=0) as fdst:
+            in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+            if verify:
+                digest = hashlib.new(VERIFY_ALGORITHM)
+                read_range(in_fd, out_fd, progress, digest.update)
+                check_digest(src, dst, out_fd, digest.digest())
+                method = 'verify'
+            elif reflink and clone_data(in_fd, out_fd):
+                method = 'reflink'
+                if progress is not None:
+                    progress(os.fstat(in_fd).st_size)
+            else:
+                method = copy_data(in_fd, out_fd, progress)
+    if metadata:
+        shutil.copystat(src, dst)
+    else:
+        shutil.copymode(src, dst)
+    return method
+
+
+def is_up_to_date(src: str, dst: str) -> bool:
+    """
+    Проверяет, совпадает ли файл назначения с исходным по размеру и mtime.
+
+    Время изменения сравнивается с допуском MTIME_TOLERANCE_NS: файловая
+    система назначения может хранить его грубее источника (FAT - с
+    точностью до 2 с, многие сетевые - до секунды), и перенесённое
+    copystat время округляется.
+
+    Args:
+        src: Путь к исходному файлу.
+        dst: Путь к файлу назначения.
+
+    Returns:
+        True, если файл назначения существует, его размер совпадает с
+        исходным, а время изменения отличается меньше чем на допуск.
+    """
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        return False
+    src_stat = os.stat(src)
+    return (
+        dst_stat.st_size == src_stat.st_size
+        and abs(dst_stat.st_mtime_ns - src_stat.st_mtime_ns)
+        < MTIME_TOLERANCE_NS
+    )
+
+
+def update_blocks(
+    src: str,
+    dst: str,
+    progress: ProgressCallback = None,
+    verify: bool = False,
+) -> int:
+    """
+    Обновляет существующий файл, перезаписывая только изменившиеся блоки.
+
+    Файлы сравниваются поблочно по CHUNK_SIZE байт; в файл назначения
+    пишутся только отличающиеся блоки, затем он обрезается до размера
+    исходного и получает его права и время изменения. Запись идёт на
+    месте, в тот же inode: у файла с жёсткими ссылками меняются все
+    ссылки, а при ошибке посередине файл остаётся частично обновлённым.
+
+    Args:
+        src: Путь к исходному файлу.
+        dst: Путь к существующему файлу назначения.
+        progress: Функция учёта сравненных байт.
+        verify: Считать хеш прочитанных блоков источника и сравнить его
+            с хешем файла назначения после обновления.
+
+    Returns:
+        Число записанных байт.
+
+    Raises:
+        ChecksumMismatch: Если файл назначения не совпал с источником.
+    """
+    digest = hashlib.new(VERIFY_ALGORITHM) if verify else None
+    written = offset = 0
+    with open(src, 'rb', buffering=0) as fsrc:
+        with open(dst, 'r+b', buffering=0) as fdst:
+            while block := fsrc.read(CHUNK_SIZE):
+                if digest is not None:
+                    digest.update(block)
+                fdst.seek(offset)
+                if fdst.read(len(block)) != block:
+                    fdst.seek(offset)
+                    view = memoryview(block)
+                    while view:
+                        view = view[fdst.write(view) :]
+                    written += len(block)
+                offset += len(block)
+                if progress is not None:
+                    progress(len(block))
+            fdst.truncate(offset)
+            if digest is not None:
+                check_digest(src, dst, fdst.fileno(), digest.digest())
+    shutil.copystat(src, dst)
+    return written
+
+
+def copy_tree(
+    src: str,
+    dst: str,
+    copy_function: Callable[[str, str], int | None],
+    workers: int = COPY_WORKERS,
+    progress: Progress | None = None,
+) -> tuple[int, int, int]:
+    """
+    Копирует дерево директорий, копируя файлы параллельно.
+
+    Сначала создаётся вся структура директорий, затем файлы копируются
+    в пуле из workers потоков, и в конце директориям снизу вверх
+    переносятся права и время изменения (после копирования файлов,
+    которое меняет mtime директорий). Семантика как у
+    shutil.copytree(..., dirs_exist_ok=True): по символическим ссылкам
+    идёт переход (ссылки на предков не обходятся), ошибки собираются и
+    выбрасываются в конце. Копируются только обычные файлы: каналы,
+    сокеты и устройства не открываются, а попадают в список ошибок.
+
+    Args:
+        src: Путь к исходной директории.
+        dst: Путь к директории назначения.
+        copy_function: Функция копирования одного файла (src, dst),
+            возвращающая число записанных байт или None, если файл
+            пропущен.
+        workers: Число потоков копирования.
+        progress: Прогресс; после обхода в него добавляется общий объём
+            файлов, после каждого файла отмечается его завершение.
+
+    Returns:
+        Кортеж (число скопированных файлов, число пропущенных файлов,
+        число записанных байт).
+
+    Raises:
+        ChecksumMismatch: Со списком файлов, если все ошибки - копии, не
+            прошедшие проверку контрольной суммы.
+        shutil.Error: Со списком (источник, назначение, ошибка), если
+            часть файлов или директорий скопировать не удалось (туда же
+            попадают и копии, не прошедшие проверку).
+    """
+    errors: list[tuple[str, str, str]] = []
+    mismatches: list[tuple[str, str, str]] = []
+    dirs: list[tuple[str, str]] = []
+    files: list[tuple[str, str]] = []
+
+    def walk_error(error: OSError) -> None:
+        errors.append((str(error.filename), dst, str(error)))
+
+    size = 0
+    for root, entries in scan_tree(
+        src, follow_symlinks=True, onerror=walk_error
+    ):
+        relative = os.path.relpath(root, src)
+        target = os.path.normpath(os.path.join(dst, relative))
+        try:
+            os.makedirs(target, exist_ok=True)
+        except OSError as error:
+            errors.append((root, target, str(error)))
+            continue
+        dirs.append((root, target))
+        for entry in entries:
+            if entry.is_dir():
+                continue
+            pair = (entry.path, os.path.join(target, entry.name))
+            try:
+                st = entry.stat()
+            except OSError as error:
+                errors.append((*pair, str(error)))
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                errors.append((*pair, f'{entry.path} - не обычный файл'))
+                continue
+            files.append(pair)
+            size += st.st_size
+
+    if progress is not None and progress.enabled:
+        progress.add_total(size, len(files))
+
+    def copy_one(pair: tuple[str, str]) -> int | None:
+        try:
+            return copy_function(*pair)
+        except ChecksumMismatch as error:
+            mismatches.append((*pair, str(error)))
+            return None
+        except OSError as error:
+            errors.append((*pair, str(error)))
+            return None
+        finally:
+            if progress is not None:
+                progress.file_done()
+
+    with ThreadPoolExecutor(workers) as pool:
+        results = list(pool.map(copy_one, files))
+    for root, target in reversed(dirs):
+        try:
+            shutil.copystat(root, target)
+        except OSError as error:
+            errors.append((root, target, str(error)))
+    if errors:
+        raise shutil.Error(errors + mismatches)
+    if mismatches:
+        raise ChecksumMismatch(
+            f'Копии не совпадают с источником (файлов: {len(mismatches)}): '
+            + ', '.join(dst for _, dst, _ in mismatches)
+        )
+    sizes = [size for size in results if size is not None]
+    return len(sizes), len(results) - len(sizes), sum(sizes)
@@ -55,3 +55,15 @@ class AlreadyExists(TerminalException):
     """Исключение создания файла с существующим именем"""
 
     pass
+
+
+class IndexNotFound(TerminalException):
+    """Исключение поиска по индексу, который не построен"""
+
+    pass
+
+
+class ChecksumMismatch(TerminalException):
+    """Исключение несовпадения контрольной суммы копии с исходным файлом"""
+
+    pass
@@ -1,7 +1,11 @@
+import fnmatch
 import os
 import shlex
+from io import BufferedReader
+from typing import Callable, Iterable, Iterator
 
 import src.config.list_of_ut
+from src.config.consts import SNIFF_SIZE
 from src.config.exceptions import (
     AlreadyExists,
     IncorrectCommand,
@@ -12,7 +16,8 @@ from src.config.exceptions import (
     PathError,
 )
 
-def resolve_file_path(file: str, path: str) -> str:
+
+def resolve_file_path(file: str, path: str, exist_ok: bool = False) -> str:
     """
     Преобразует путь назначения для утилит, которые создают файлы.
 
@@ -21,12 +26,14 @@ def resolve_file_path(file: str, path: str) -> str:
     Args:
         file: Имя создаваемого файла.
         path: Путь назначения.
+        exist_ok: Разрешить существующий файл (для обновления).
 
     Returns:
         Путь к создаваемому файлу.
 
     Raises:
-        AlreadyExists: Если создаваемый файл уже существует.
+        AlreadyExists: Если создаваемый файл уже существует и exist_ok
+            не указан.
         PathError: Если родительская директория не существует.
         IsNotDirectory: Если родительская директория не директория.
     """
@@ -35,7 +42,7 @@ def resolve_file_path(file: str, path: str) -> str:
         target_path = os.path.join(abs_path, file)
     else:
         target_path = abs_path
-    if os.path.exists(target_path):
+    if os.path.exists(target_path) and not exist_ok:
         raise AlreadyExists(f'{target_path} уже существует')
 
     parent_dir = os.path.dirname(target_path)
@@ -68,6 +75,22 @@ def normalize_path(path: str) -> str:
         raise PathError(f'Не существует указанного пути {path}')
 
 
+def is_binary(stream: BufferedReader) -> bool:
+    """
+    Проверяет, является ли поток двоичным.
+
+    Поток считается двоичным, если в первых SNIFF_SIZE байтах есть NUL.
+    Байты читаются через peek, позиция потока не меняется.
+
+    Args:
+        stream: Буферизованный поток для чтения.
+
+    Returns:
+        True, если поток двоичный.
+    """
+    return b'\0' in stream.peek(SNIFF_SIZE)[:SNIFF_SIZE]
+
+
 def is_correct_directory(path: str) -> bool:
     """
     Проверяет, является ли путь директорией.
@@ -108,6 +131,11 @@ def tokenize(stdin: str) -> tuple[str, set, list[str]]:
     """
     Разбирает входную строку на команду, флаги и аргументы.
 
+    Флагами считаются все ведущие аргументы, начинающиеся с '-'.
+    Короткие флаги можно объединять (-ri), значение передаётся
+    через '=' (--jobs=4, -j=4) и сохраняется как 'имя=значение'.
+    Аргумент '--' завершает список флагов.
+
     Args:
         stdin: Строка от пользователя.
 
@@ -125,16 +153,22 @@ def tokenize(stdin: str) -> tuple[str, set, list[str]]:
     flags, paths = set(), []
     if command not in src.config.list_of_ut.UTILITIES:
         raise IncorrectCommand(f'Неизвестная команда {command}')
-    if args:
-        if args[0].startswith('--'):
-            flags.add(args[0][2:])
-            paths = args[1:]
-        elif args[0].startswith('-'):
-            flags = set(args[0][1:])
-            paths = args[1:]
+    for i, arg in enumerate(args):
+        if arg == '--':
+            paths = args[i + 1 :]
+            break
+        if arg.startswith('--'):
+            flags.add(arg[2:])
+        elif arg.startswith('-') and len(arg) > 1:
+            short, sep, value = arg[1:].partition('=')
+            if sep:
+                flags.update(short[:-1])
+                flags.add(f'{short[-1:]}={value}')
+            else:
+                flags.update(short)
         else:
-            flags = set()
-            paths = args
+            paths = args[i:]
+            break
     return (command, flags, paths)
 
 
@@ -153,6 +187,161 @@ def is_correct_flag(flag: set, allowed_flags: set) -> bool:
         IncorrectFlag: Если хотя бы один флаг недопустим.
     """
     for f in flag:
-        if f not in allowed_flags:
+        if f.partition('=')[0] not in allowed_flags:
             raise IncorrectFlag(f'Неправильный флаг {f}')
     return True
+
+
+def get_flag_value(
+    flags: set, names: set, default: str | None = None
+) -> str | None:
+    """
+    Возвращает значение флага, переданного в виде 'имя=значение'.
+
+    Args:
+        flags: Множество флагов от пользователя.
+        names: Допустимые имена флага (короткое и длинное).
+        default: Значение, если флаг не указан.
+
+    Returns:
+        Значение флага или default.
+    """
+    for f in flags:
+        name, sep, value = f.partition('=')
+        if sep and name in names:
+            return value
+    return default
+
+
+def get_int_flag(flags: set, names: set, default: int) -> int:
+    """
+    Возвращает целочисленное значение флага 'имя=значение'.
+
+    Args:
+        flags: Множество флагов от пользователя.
+        names: Допустимые имена флага (короткое и длинное).
+        default: Значение, если флаг не указан.
+
+    Returns:
+        Значение флага или default.
+
+    Raises:
+        IncorrectFlag: Если значение не является неотрицательным числом.
+    """
+    value = get_flag_value(flags, names)
+    if value is None:
+        return default
+    if not value.isdigit():
+        raise IncorrectFlag(f'Неверное значение флага {value}')
+    return int(value)
+
+
+def human_size(size: int) -> str:
+    """
+    Переводит число байт в короткую запись с единицами (как du -h).
+
+    Args:
+        size: Размер в байтах.
+
+    Returns:
+        Строка вида '512', '1.5K', '12M', '3.0G'.
+    """
+    value = float(size)
+    for unit in ('', 'K', 'M', 'G', 'T', 'P'):
+        if value < 1024 or unit == 'P':
+            break
+        value /= 1024
+    if not unit:
+        return str(size)
+    return f'{value:.1f}{unit}' if value < 10 else f'{value:.0f}{unit}'
+
+
+def is_ignored(name: str, ignore: Iterable[str]) -> bool:
+    """
+    Проверяет, подходит ли имя под один из шаблонов игнорирования.
+
+    Args:
+        name: Имя файла или директории.
+        ignore: Шаблоны в формате fnmatch (например, '.git', '*.pyc').
+
+    Returns:
+        True, если имя нужно пропустить.
+    """
+    return any(fnmatch.fnmatch(name, pattern) for pattern in ignore)
+
+
+def scan_tree(
+    path: str,
+    ignore: Iterable[str] = (),
+    follow_symlinks: bool = False,
+    onerror: Callable[[OSError], None] | None = None,
+) -> Iterator[tuple[str, list[os.DirEntry]]]:
+    """
+    Итеративно и лениво обходит дерево директорий через os.scandir.
+
+    Каждая директория читается один раз, тип записей берётся из
+    DirEntry без дополнительного stat. Рекурсии нет, поэтому глубина
+    дерева не ограничена. Недоступные для чтения директории
+    пропускаются, ошибка передаётся в onerror. Символические ссылки на
+    директории раскрываются только с follow_symlinks; тогда для каждой
+    директории помнится цепочка предков (st_dev, st_ino), и ссылка на
+    предка (цикл) не обходится.
+
+    Args:
+        path: Путь к корневой директории.
+        ignore: Шаблоны имён, которые нужно пропускать вместе с содержимым.
+        follow_symlinks: Обходить директории по символическим ссылкам.
+        onerror: Функция, вызываемая с OSError для недоступной
+            директории.
+
+    Yields:
+        Кортежи (путь к директории, записи директории).
+    """
+    ignore = tuple(ignore)
+    stack: list[tuple[str, tuple | None]] = [(path, None)]
+    while stack:
+        current, parents = stack.pop()
+        try:
+            if follow_symlinks:
+                st = os.stat(current)
+                key = (st.st_dev, st.st_ino)
+                chain = parents
+                while chain is not None and chain[0] != key:
+                    chain = chain[1]
+                if chain is not None:
+                    continue
+                parents = (key, parents)
+            with os.scandir(current) as it:
+                entries = [e for e in it if not is_ignored(e.name, ignore)]
+        except OSError as error:
+            if onerror is not None:
+                onerror(error)
+            continue
+        yield current, entries
+        stack.extend(
+            (entry.path, parents)
+            for entry in reversed(entries)
+            if entry.is_dir(follow_symlinks=follow_symlinks)
+        )
+
+
+def walk_files(path: str, ignore: Iterable[str] = ()) -> Iterator[str]:
+    """
+    Лениво отдаёт пути ко всем обычным файлам в дереве директорий.
+
+    Символические ссылки на директории раскрываются (с защитой от
+    циклов), ссылки на файлы отдаются как файлы. Сокеты, FIFO, устройства
+    и битые ссылки пропускаются: их нельзя читать как файлы, а open() на
+    FIFO блокируется.
+
+    Args:
+        path: Путь к корневой директории.
+        ignore: Шаблоны имён, которые нужно пропускать.
+
+    Yields:
+        Пути к файлам.
+    """
+    for _, entries in scan_tree(path, ignore, follow_symlinks=True):
+        for entry in entries:
+            if entry.is_file():
+                yield entry.path
@@ -14,4 +14,9 @@ UTILITIES = [
     'grep',
     'touch',
     'mkdir',
+    'index',
+    'du',
+    'head',
+    'tail',
+    'wc',
 ]
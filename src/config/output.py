@@ -0,0 +1,80 @@
+import sys
+import time
+from types import TracebackType
+from typing import TextIO
+
+from src.config.consts import OUTPUT_BUFFER_SIZE, OUTPUT_FLUSH_INTERVAL
+
+
+class Output:
+    """
+    Буферизованный вывод для команд с большим объёмом строк.
+
+    Если вывод идёт в терминал, строки пишутся сразу (построчная
+    буферизация потока). Если в файл или канал, строки копятся и
+    пишутся одним блоком, когда буфер превышает size символов, с прошлой
+    записи прошло больше interval секунд или команда завершилась.
+
+    Используется как контекстный менеджер:
+
+        with Output() as out:
+            out.write('строка\\n')
+
+    Attributes:
+        stream: Поток вывода (по умолчанию текущий sys.stdout).
+        line_buffered: True, если поток - терминал.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        size: int = OUTPUT_BUFFER_SIZE,
+        interval: float = OUTPUT_FLUSH_INTERVAL,
+    ) -> None:
+        self.stream = stream if stream is not None else sys.stdout
+        self.line_buffered = self.stream.isatty()
+        self.size = size
+        self.interval = interval
+        self.parts: list[str] = []
+        self.length = 0
+        self.last_flush = time.monotonic()
+
+    def write(self, text: str) -> None:
+        """
+        Добавляет текст в буфер и при необходимости сбрасывает его.
+
+        Args:
+            text: Текст для вывода.
+        """
+        if self.line_buffered:
+            self.stream.write(text)
+            return
+        self.parts.append(text)
+        self.length += len(text)
+        if (
+            self.length >= self.size
+            or time.monotonic() - self.last_flush >= self.interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Записывает накопленный текст в поток одним блоком.
+        """
+        if self.parts:
+            self.stream.write(''.join(self.parts))
+            self.parts.clear()
+            self.length = 0
+        self.stream.flush()
+        self.last_flush = time.monotonic()
+
+    def __enter__(self) -> 'Output':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.flush()
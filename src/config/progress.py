@@ -0,0 +1,153 @@
+import sys
+import threading
+import time
+from collections.abc import Callable
+from types import TracebackType
+from typing import TextIO
+
+from src.config.consts import PROGRESS_INTERVAL
+from src.config.functions import human_size
+
+
+class Progress:
+    """
+    Строка прогресса для долгих операций копирования и архивации.
+
+    Показывает скопированные байты и файлы, скорость и оставшееся время.
+    Счётчики обновляет сам цикл копирования (update после каждого блока,
+    file_done после каждого файла), строка перерисовывается не чаще
+    раза в interval секунд. Прогресс выводится, только если поток -
+    терминал и не указан флаг --no-progress; иначе update и file_done
+    сразу возвращаются, а callback равен None, и цикл копирования не
+    тратит время на подсчёт.
+
+    Используется как контекстный менеджер:
+
+        with Progress(flags) as progress:
+            progress.add_total(size)
+            copy_file(src, dst, progress=progress.callback)
+            progress.file_done()
+
+    Attributes:
+        stream: Поток вывода (по умолчанию текущий sys.stderr).
+        enabled: True, если прогресс выводится.
+        total_bytes: Ожидаемое число байт (0 - неизвестно).
+        total_files: Ожидаемое число файлов.
+        done_bytes: Обработанное число байт.
+        done_files: Обработанное число файлов.
+    """
+
+    def __init__(
+        self,
+        flags: set,
+        stream: TextIO | None = None,
+        interval: float = PROGRESS_INTERVAL,
+    ) -> None:
+        self.stream = stream if stream is not None else sys.stderr
+        self.enabled = 'no-progress' not in flags and self.stream.isatty()
+        self.interval = interval
+        self.total_bytes = self.total_files = 0
+        self.done_bytes = self.done_files = 0
+        self.start = self.last_draw = time.monotonic()
+        self.width = 0
+        self.lock = threading.Lock()
+
+    @property
+    def callback(self) -> Callable[[int], None] | None:
+        """
+        Функция для цикла копирования или None, если прогресс выключен.
+        """
+        return self.update if self.enabled else None
+
+    def add_total(self, size: int, files: int = 1) -> None:
+        """
+        Увеличивает ожидаемый объём работы.
+
+        Args:
+            size: Число байт.
+            files: Число файлов.
+        """
+        if self.enabled:
+            with self.lock:
+                self.total_bytes += size
+                self.total_files += files
+
+    def update(self, size: int) -> None:
+        """
+        Учитывает обработанный блок и при необходимости перерисовывает строку.
+
+        Args:
+            size: Число байт в блоке.
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            self.done_bytes += size
+            self.draw_throttled()
+
+    def file_done(self) -> None:
+        """
+        Учитывает обработанный файл.
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            self.done_files += 1
+            self.draw_throttled()
+
+    def draw_throttled(self) -> None:
+        """
+        Перерисовывает строку, если с прошлой отрисовки прошло interval.
+        """
+        now = time.monotonic()
+        if now - self.last_draw >= self.interval:
+            self.draw(now)
+
+    def draw(self, now: float) -> None:
+        """
+        Перерисовывает строку прогресса.
+
+        Args:
+            now: Текущее время time.monotonic().
+        """
+        self.last_draw = now
+        elapsed = now - self.start
+        rate = self.done_bytes / elapsed if elapsed else 0.0
+        line = f'{human_size(self.done_bytes)}'
+        if self.total_bytes:
+            line += f'/{human_size(self.total_bytes)}'
+        line += f', файлов {self.done_files}'
+        if self.total_files:
+            line += f'/{self.total_files}'
+        line += f', {human_size(int(rate))}/с'
+        if self.total_bytes and rate:
+            left = max(self.total_bytes - self.done_bytes, 0) / rate
+            line += f', осталось {int(left) // 60}:{int(left) % 60:02}'
+        self.stream.write(f'\r{line:<{self.width}}')
+        self.stream.flush()
+        self.width = len(line)
+
+    def close(self) -> None:
+        """
+        Выводит итоговое состояние и переводит строку.
+
+        Если строка ни разу не выводилась и ничего не учтено (например,
+        mv внутри одной файловой системы), ничего не выводится.
+        """
+        drawn = self.width or self.done_bytes or self.done_files
+        if self.enabled and drawn:
+            with self.lock:
+                self.draw(time.monotonic())
+                self.stream.write('\n')
+                self.stream.flush()
+
+    def __enter__(self) -> 'Progress':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
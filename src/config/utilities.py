@@ -5,14 +5,19 @@ from src.utilities import (
     cat,
     cd,
     cp,
+    du,
     grep,
+    head,
     history,
+    index,
     ls,
     mkdir,
     mv,
     rm,
+    tail,
     touch,
     undo,
+    wc,
 )
 
 UTILITIES: dict[str, Callable] = {
@@ -31,4 +36,9 @@ UTILITIES: dict[str, Callable] = {
     'grep': grep.grep,
     'touch': touch.touch,
     'mkdir': mkdir.mkdir,
+    'index': index.index,
+    'du': du.du,
+    'head': head.head,
+    'tail': tail.tail,
+    'wc': wc.wc,
 }
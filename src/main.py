@@ -7,12 +7,52 @@ from src.config.logger import main_logger
 from src.config.utilities import UTILITIES
 
 
+def execute(command: str, flags: set, paths: list[str]) -> int:
+    """
+    Выполняет утилиту и возвращает код завершения.
+
+    Утилиты, отвечающие да/нет (grep -q), возвращают bool: False
+    превращается в код 1, любой другой результат - в 0.
+
+    Args:
+        command: Имя утилиты.
+        flags: Флаги утилиты.
+        paths: Аргументы утилиты.
+
+    Returns:
+        Код завершения: 0 - успех, 1 - ответ 'нет'.
+    """
+    if command in ['zip', 'tar', 'unzip', 'untar']:
+        result = UTILITIES[command](command, flags, paths)
+    else:
+        result = UTILITIES[command](flags, paths)
+    return 1 if result is False else 0
+
+
+def prompt(current_dir: str, status: int) -> str:
+    """
+    Возвращает приглашение к вводу.
+
+    Ненулевой код завершения предыдущей команды показывается перед
+    директорией, как в zsh и fish: '[1] ~/dir$ '.
+
+    Args:
+        current_dir: Текущая директория для показа.
+        status: Код завершения предыдущей команды.
+
+    Returns:
+        Строка приглашения.
+    """
+    return f'[{status}] {current_dir}$ ' if status else f'{current_dir}$ '
+
+
 def main() -> None:
     init_env()
     with open(HISTORY_PATH, 'r') as f:
         history_lines = len(f.readlines())
     current_dir = os.getcwd().replace(os.path.expanduser('~'), '~')
-    while (stdin := input(f'{current_dir}$ ')) != 'exit':
+    status = 0
+    while (stdin := input(prompt(current_dir, status))) != 'exit':
         if not stdin:
             continue
         try:
@@ -21,12 +61,10 @@ def main() -> None:
             history_lines += 1
             main_logger.info(stdin)
             command, flags, paths = tokenize(stdin)
-            if command in ['zip', 'tar', 'unzip', 'untar']:
-                UTILITIES[command](command, flags, paths)
-            else:
-                UTILITIES[command](flags, paths)
-            main_logger.info('Success')
+            status = execute(command, flags, paths)
+            main_logger.info('Success' if not status else f'Код {status}')
         except Exception as message:
+            status = 1
             print(f'{type(message).__name__}: {message}')
             main_logger.error(message)
         finally:
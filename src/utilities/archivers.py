@@ -1,16 +1,29 @@
+import io
 import os
 import shutil
+import tarfile
+import zipfile
+from collections.abc import Callable
+from typing import BinaryIO, Iterator, cast
 
+from src.config.consts import CHUNK_SIZE
 from src.config.exceptions import (
     AlreadyExists,
     IncorrectFlag,
     IncorrectInput,
     IsNotArchive,
 )
-from src.config.functions import is_correct_directory, normalize_path
+from src.config.functions import (
+    is_correct_directory,
+    is_correct_flag,
+    normalize_path,
+    scan_tree,
+)
+from src.config.progress import Progress
 
 zip = 'zip'
 unzip = 'unzip'
+ARCHIVE_EXTENSIONS = ('.zip', '.tar', '.tar.gz', '.tar.bz', '.tar.xz')
 
 
 def is_archive(path: str) -> bool:
@@ -28,43 +41,203 @@ def is_archive(path: str) -> bool:
     Raises:
         IsNotArchive: Если файл не является архивом поддерживаемого формата.
     """
-    for exp in ['.zip', '.tar', '.tar.gz', '.tar.bz', '.tar.xz']:
-        if path.endswith(exp):
-            return True
+    if path.endswith(ARCHIVE_EXTENSIONS):
+        return True
     raise IsNotArchive(f'{path} - не архив.')
 
 
+def iter_members(path: str) -> Iterator[tuple[str, io.BufferedReader]]:
+    """
+    Лениво открывает файлы внутри архива без распаковки на диск.
+
+    Содержимое распаковывается на лету при чтении. Архив TAR читается
+    последовательно, поэтому сжатый поток проходится один раз. Поток
+    члена архива закрывается при переходе к следующему.
+
+    Args:
+        path: Путь к архиву .zip или .tar[.gz|.bz|.xz].
+
+    Yields:
+        Кортежи (путь внутри архива, буферизованный поток содержимого).
+    """
+    if path.endswith('.zip'):
+        with zipfile.ZipFile(path) as zip_archive:
+            for zip_info in zip_archive.infolist():
+                if zip_info.is_dir():
+                    continue
+                raw = cast(io.RawIOBase, zip_archive.open(zip_info))
+                with io.BufferedReader(raw, CHUNK_SIZE) as member:
+                    yield zip_info.filename, cast(io.BufferedReader, member)
+        return
+    with tarfile.open(path, 'r:*') as tar_archive:
+        for tar_info in tar_archive:
+            if not tar_info.isfile():
+                continue
+            stream = tar_archive.extractfile(tar_info)
+            if stream is not None:
+                with stream:
+                    yield tar_info.name, cast(io.BufferedReader, stream)
+
+
+class ProgressReader:
+    """
+    Файл для чтения, сообщающий прогрессу о каждом прочитанном блоке.
+
+    Передаётся в tarfile.addfile, который копирует содержимое файла в
+    архив блоками через read.
+
+    Attributes:
+        file: Исходный файл.
+        progress: Функция учёта прочитанных байт.
+    """
+
+    def __init__(self, file: BinaryIO, progress: Callable[[int], None]):
+        self.file = file
+        self.progress = progress
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.file.read(size)
+        self.progress(len(data))
+        return data
+
+
+def archive_members(dir_path: str, skip: str) -> list[tuple[str, str, int]]:
+    """
+    Собирает записи дерева для архивации.
+
+    Args:
+        dir_path: Абсолютный путь к архивируемой директории.
+        skip: Абсолютный путь к создаваемому архиву (не архивируется).
+
+    Returns:
+        Список кортежей (путь, путь внутри архива, размер); у директорий и
+        не обычных файлов размер равен -1.
+    """
+    members = []
+    for _, entries in scan_tree(dir_path):
+        for entry in sorted(entries, key=lambda e: e.name):
+            if entry.path == skip:
+                continue
+            arcname = os.path.relpath(entry.path, dir_path)
+            if entry.is_file(follow_symlinks=False):
+                size = entry.stat(follow_symlinks=False).st_size
+            else:
+                size = -1
+            members.append((entry.path, arcname, size))
+    return members
+
+
+def write_zip(
+    archive: str,
+    members: list[tuple[str, str, int]],
+    progress: Progress,
+) -> None:
+    """
+    Записывает файлы в .zip, сжимая их блоками по CHUNK_SIZE байт.
+
+    Args:
+        archive: Путь к создаваемому архиву.
+        members: Записи из archive_members.
+        progress: Прогресс архивации.
+    """
+    callback = progress.callback
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zip_archive:
+        for path, arcname, size in members:
+            if size < 0 and os.path.isdir(path):
+                zip_archive.write(path, arcname)
+                continue
+            if not os.path.isfile(path):
+                continue
+            zip_info = zipfile.ZipInfo.from_file(path, arcname)
+            zip_info.compress_type = zipfile.ZIP_DEFLATED
+            with (
+                open(path, 'rb') as src,
+                zip_archive.open(zip_info, 'w') as dst,
+            ):
+                while chunk := src.read(CHUNK_SIZE):
+                    dst.write(chunk)
+                    if callback is not None:
+                        callback(len(chunk))
+            progress.file_done()
+
+
+def write_tar(
+    archive: str,
+    dir_path: str,
+    members: list[tuple[str, str, int]],
+    progress: Progress,
+) -> None:
+    """
+    Записывает файлы в .tar.gz; символические ссылки не раскрываются,
+    сокеты пропускаются (как в shutil.make_archive).
+
+    Args:
+        archive: Путь к создаваемому архиву.
+        dir_path: Абсолютный путь к архивируемой директории.
+        members: Записи из archive_members.
+        progress: Прогресс архивации.
+    """
+    callback = progress.callback
+    with tarfile.open(archive, 'w:gz') as tar_archive:
+        tar_archive.add(dir_path, arcname='.', recursive=False)
+        for path, arcname, size in members:
+            tar_info = tar_archive.gettarinfo(path, os.path.join('.', arcname))
+            if tar_info is None:
+                continue
+            if size < 0:
+                tar_archive.addfile(tar_info)
+                continue
+            with open(path, 'rb') as src:
+                if callback is None:
+                    tar_archive.addfile(tar_info, src)
+                else:
+                    reader = ProgressReader(src, callback)
+                    tar_archive.addfile(tar_info, cast(BinaryIO, reader))
+            progress.file_done()
+
+
 def make_archive(command: str, flags: set, paths: list[str]) -> None:
     """
     Создаёт архив из указанной директории.
 
-    Формат архива зависит от команды: 'zip' создаёт .zip, 'tar' создаёт .tar.gz
+    Формат архива зависит от команды: 'zip' создаёт .zip, 'tar' создаёт
+    .tar.gz. Файлы читаются и сжимаются блоками, а прогресс (объём,
+    файлы, скорость, оставшееся время) обновляется после каждого блока.
 
     Args:
         command: Формат архива ('zip' или 'tar').
-        flags: Флаг утилиты. Должен быть пустым.
+        flags: Множество флагов команды:
+            - 'no-progress': не выводить строку прогресса (она выводится
+              в stderr, только если это терминал).
         paths: Список из двух элементов [путь_к_директории, имя_архива].
 
     Returns:
         None
 
+    Prints:
+        В терминал (stderr) - прогресс архивации.
+
     Raises:
-        IncorrectFlag: Если указаны флаги.
+        IncorrectFlag: Если указан неверный флаг.
         IncorrectInput: Если количество путей не равно 2.
         IsNotDirectory: Если исходный путь не является директорией.
         PathError: Если указан несуществующий файл.
     """
-    if flags:
-        raise IncorrectFlag(f'Для {command} не поддерживаются флаги')
+    is_correct_flag(flags, {'no-progress'})
     if len(paths) > 2:
         raise IncorrectInput(f'Неверное количество аргументов для {command}')
     dir_path = normalize_path(paths[0])
     is_correct_directory(dir_path)
-    dest_path = paths[-1]
-    if command == zip:
-        shutil.make_archive(dest_path, 'zip', dir_path)
-    else:
-        shutil.make_archive(dest_path, 'gztar', dir_path)
+    extension = '.zip' if command == zip else '.tar.gz'
+    archive = os.path.abspath(paths[-1] + extension)
+    members = archive_members(dir_path, archive)
+    with Progress(flags) as progress:
+        files = [size for _, _, size in members if size >= 0]
+        progress.add_total(sum(files), len(files))
+        if command == zip:
+            write_zip(archive, members, progress)
+        else:
+            write_tar(archive, dir_path, members, progress)
 
 
 def unpack(command: str, flags: set, paths: list[str]) -> None:
@@ -1,33 +1,242 @@
+import codecs
+import os
+import sys
+from collections.abc import Iterator
+from typing import BinaryIO
+
+from src.config.consts import CHUNK_SIZE
 from src.config.exceptions import IncorrectFlag, IncorrectInput
-from src.config.functions import is_correct_file, normalize_path
+from src.config.functions import (
+    get_flag_value,
+    is_correct_file,
+    is_correct_flag,
+    normalize_path,
+)
+
+
+def stdout_fd() -> int | None:
+    """
+    Возвращает дескриптор stdout, если вывод идёт в файл или канал.
+
+    Returns:
+        Дескриптор или None, если stdout - терминал или не имеет
+        дескриптора (например, перехвачен в тестах).
+    """
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+    return None if os.isatty(fd) else fd
+
+
+def send_file(f: BinaryIO, out_fd: int, start: int, end: int) -> bytes | None:
+    """
+    Копирует диапазон файла в дескриптор вывода средствами ядра.
+
+    Байты не попадают в память процесса и не декодируются.
+
+    Args:
+        f: Файл, открытый в бинарном режиме.
+        out_fd: Дескриптор вывода.
+        start: Начало диапазона.
+        end: Конец диапазона (не включая).
+
+    Returns:
+        Последний записанный байт (b'' для пустого диапазона) или None,
+        если os.sendfile недоступен для этой пары дескрипторов и ничего не
+        записано.
+    """
+    if start >= end:
+        return b''
+    if not hasattr(os, 'sendfile'):
+        return None
+    in_fd = f.fileno()
+    offset = start
+    while offset < end:
+        try:
+            sent = os.sendfile(out_fd, in_fd, offset, end - offset)
+        except OSError:
+            if offset > start:
+                raise
+            return None
+        if not sent:
+            break
+        offset += sent
+    return os.pread(in_fd, 1, offset - 1) if offset > start else b''
+
+
+def iter_chunks(f: BinaryIO, start: int, end: int | None) -> Iterator[bytes]:
+    """
+    Читает диапазон файла блоками по CHUNK_SIZE байт.
+
+    Args:
+        f: Файл, открытый в бинарном режиме.
+        start: Начало диапазона.
+        end: Конец диапазона (не включая) или None - до конца файла.
+
+    Yields:
+        Блоки байтов.
+    """
+    f.seek(start)
+    left = -1 if end is None else end - start
+    while left:
+        chunk = f.read(CHUNK_SIZE if left < 0 else min(CHUNK_SIZE, left))
+        if not chunk:
+            break
+        left = left - len(chunk) if left > 0 else left
+        yield chunk
+
+
+def write_bytes(
+    f: BinaryIO, out_fd: int, start: int, end: int | None
+) -> bytes:
+    """
+    Копирует диапазон файла в дескриптор вывода блоками.
+
+    Args:
+        f: Файл, открытый в бинарном режиме.
+        out_fd: Дескриптор вывода.
+        start: Начало диапазона.
+        end: Конец диапазона (не включая) или None - до конца файла.
+
+    Returns:
+        Последний записанный байт (b'' для пустого диапазона).
+    """
+    last = b''
+    for chunk in iter_chunks(f, start, end):
+        view = memoryview(chunk)
+        while view:
+            view = view[os.write(out_fd, view) :]
+        last = chunk[-1:]
+    return last
+
+
+def write_text(f: BinaryIO, start: int, end: int | None) -> bytes:
+    """
+    Выводит диапазон файла в sys.stdout как текст, декодируя его блоками.
+
+    Байты, не являющиеся UTF-8, заменяются символом замены; символ,
+    разрезанный границей блока, декодируется целиком.
+
+    Args:
+        f: Файл, открытый в бинарном режиме.
+        start: Начало диапазона.
+        end: Конец диапазона (не включая) или None - до конца файла.
+
+    Returns:
+        Последний прочитанный байт (b'' для пустого диапазона).
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    last = b''
+    for chunk in iter_chunks(f, start, end):
+        sys.stdout.write(decoder.decode(chunk))
+        last = chunk[-1:]
+    sys.stdout.write(decoder.decode(b'', final=True))
+    return last
+
+
+def write_range(f: BinaryIO, start: int = 0, end: int | None = None) -> bytes:
+    """
+    Выводит диапазон файла в stdout, не читая файл целиком.
+
+    Если stdout - файл или канал, байты копируются без декодирования:
+    через os.sendfile, а если он недоступен, блоками по CHUNK_SIZE.
+    В терминал диапазон выводится как UTF-8 текст с заменой
+    некорректных байтов.
+
+    Args:
+        f: Файл, открытый в бинарном режиме.
+        start: Начало диапазона.
+        end: Конец диапазона (не включая) или None - до конца файла.
+
+    Returns:
+        Последний выведенный байт (b'' для пустого диапазона).
+    """
+    out_fd = stdout_fd()
+    if out_fd is None:
+        return write_text(f, start, end)
+    sys.stdout.flush()
+    stop = os.fstat(f.fileno()).st_size if end is None else end
+    sent = send_file(f, out_fd, start, stop)
+    if sent is None:
+        return write_bytes(f, out_fd, start, end)
+    if end is None:
+        return write_bytes(f, out_fd, stop, None) or sent
+    return sent
+
+
+def end_line(last: bytes) -> None:
+    """
+    Переводит строку, если вывод не закончился переводом строки.
+
+    Args:
+        last: Последний выведенный байт.
+    """
+    if last not in (b'', b'\n'):
+        print()
+
+
+def get_byte_range(flags: set, size: int) -> tuple[int, int]:
+    """
+    Возвращает диапазон байтов из флага --bytes=A:B.
+
+    Границы можно опускать: 'A:' - с A до конца, ':B' - с начала до B.
+    Диапазон обрезается по размеру файла.
+
+    Args:
+        flags: Флаги cat.
+        size: Размер файла.
+
+    Returns:
+        Кортеж (начало, конец) диапазона, конец не включается.
+
+    Raises:
+        IncorrectFlag: Если значение 'bytes' не указано или неверно.
+    """
+    value = get_flag_value(flags, {'bytes'})
+    if value is None:
+        return 0, size
+    first, sep, second = value.partition(':')
+    if not sep or not all(part.isdigit() for part in (first, second) if part):
+        raise IncorrectFlag(f'Неверный диапазон байтов {value}: нужно A:B')
+    start = min(int(first or 0), size)
+    end = min(int(second), size) if second else size
+    return start, max(start, end)
 
 
 def cat(flags: set, paths: list[str]) -> None:
     """
     Выводит содержимое файлов.
 
+    Файлы не читаются целиком, а передаются потоком (см. write_range).
+    Если файл не заканчивается переводом строки, он добавляется.
+
     Args:
-        flags: Флаг утилиты. Должен быть пустым.
+        flags: множество флагов:
+            - 'bytes=A:B': вывести только байты с A до B (не включая).
         paths: Список путей. Должен содержать хотя бы один файл.
 
     Prints:
         Печатает содержимое файлов.
 
     Raises:
-        IncorrectFlag: Если указан флаг.
+        IncorrectFlag: Если указан неверный флаг или диапазон.
         IncorrectInput: Если список paths пуст.
         PathError: Если указанный путь не существует.
         IsNotFile: Если путь указывает на директорию.
     """
-    if flags:
-        raise IncorrectFlag('Для cat не поддерживаются флаги')
+    is_correct_flag(flags, {'bytes'})
+    if 'bytes' in flags:
+        raise IncorrectFlag('Не указан диапазон байтов: --bytes=A:B')
     if not paths:
         raise IncorrectInput('Не указан файл для чтения')
     for file in paths:
         path: str = normalize_path(file)
         is_correct_file(path)
-        with open(path, 'r', encoding='utf-8') as f:
-            cont = f.read().strip()
-            if cont:  # Нужна, чтобы при вызове на cat на
-                # пустой файл не было пустой строки между вызовами
-                print(cont)
+        with open(path, 'rb', buffering=CHUNK_SIZE) as f:
+            if get_flag_value(flags, {'bytes'}) is None:
+                last = write_range(f)
+            else:
+                size = os.fstat(f.fileno()).st_size
+                last = write_range(f, *get_byte_range(flags, size))
+        end_line(last)
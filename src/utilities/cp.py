@@ -1,15 +1,126 @@
 import os
-import shutil
+import time
 
 from src.config.consts import FOR_UNDO_HISTORY
-from src.config.exceptions import IncorrectInput
+from src.config.copy_engine import (
+    copy_file,
+    copy_tree,
+    is_up_to_date,
+    update_blocks,
+)
+from src.config.exceptions import IncorrectFlag, IncorrectInput
 from src.config.functions import (
+    get_flag_value,
+    human_size,
     is_correct_directory,
     is_correct_file,
     is_correct_flag,
     normalize_path,
     resolve_file_path,
 )
+from src.config.logger import main_logger
+from src.config.progress import Progress
+
+
+def report_copy(flags: set, src: str, dst: str, method: str) -> None:
+    """
+    Сообщает, каким способом скопирован файл.
+
+    Способ всегда записывается в лог, а с флагом -v ещё и выводится.
+
+    Args:
+        flags: Флаги cp.
+        src: Путь к исходному файлу.
+        dst: Путь к скопированному файлу.
+        method: Способ копирования (copy_file_range, sendfile, readinto).
+    """
+    main_logger.info(f'cp {src} -> {dst}: {method}')
+    if 'v' in flags or 'verbose' in flags:
+        print(f'{src} -> {dst} ({method})')
+
+
+def check_copy_mode(flags: set) -> None:
+    """
+    Проверяет совместимость флагов --link, --reflink и --verify.
+
+    Args:
+        flags: Флаги cp.
+
+    Raises:
+        IncorrectFlag: Если у reflink значение не 'auto', --link указан
+            вместе с --reflink или с режимом обновления, --verify - с
+            --link или --reflink.
+    """
+    reflink = get_flag_value(flags, {'reflink'})
+    if reflink not in (None, 'auto'):
+        raise IncorrectFlag(f'Неверное значение reflink: {reflink}')
+    reflink_set = reflink is not None or 'reflink' in flags
+    if 'verify' in flags and (reflink_set or {'l', 'link'} & flags):
+        raise IncorrectFlag('--verify нельзя указывать с --link/--reflink')
+    if not {'l', 'link'} & flags:
+        return
+    if reflink_set:
+        raise IncorrectFlag('--link нельзя указывать вместе с --reflink')
+    if {'u', 'update', 'delta'} & flags:
+        raise IncorrectFlag('--link нельзя указывать вместе с -u/--delta')
+
+
+def copy_one(
+    flags: set, src: str, dst: str, metadata: bool, progress: Progress
+) -> int | None:
+    """
+    Копирует один файл с учётом режима обновления.
+
+    С --update файл пропускается, если в назначении уже есть файл с теми
+    же размером и временем изменения; время изменения при копировании
+    сохраняется, чтобы следующий запуск его пропустил. С --delta
+    существующий файл назначения не перезаписывается целиком, а
+    обновляются только изменившиеся блоки. С --link вместо копии
+    создаётся жёсткая ссылка, с --reflink=auto - reflink-копия, если
+    файловая система её поддерживает. С --verify скопированные данные
+    сверяются по контрольной сумме.
+
+    Args:
+        flags: Флаги cp.
+        src: Путь к исходному файлу.
+        dst: Путь к файлу назначения.
+        metadata: Переносить время изменения (иначе только права).
+        progress: Прогресс копирования; пропущенный файл учитывается в
+            нём целиком.
+
+    Returns:
+        Число записанных байт или None, если файл пропущен.
+
+    Raises:
+        ChecksumMismatch: Если копия не прошла проверку (--verify).
+    """
+    if 'l' in flags or 'link' in flags:
+        os.link(src, dst)
+        report_copy(flags, src, dst, 'link')
+        size = os.path.getsize(dst)
+        progress.update(size)
+        return size
+    update = bool({'u', 'update', 'delta'} & flags)
+    if update and is_up_to_date(src, dst):
+        report_copy(flags, src, dst, 'skipped')
+        progress.update(os.path.getsize(src))
+        return None
+    if 'delta' in flags and os.path.isfile(dst):
+        written = update_blocks(
+            src, dst, progress.callback, verify='verify' in flags
+        )
+        report_copy(flags, src, dst, 'delta')
+        return written
+    method = copy_file(
+        src,
+        dst,
+        metadata=metadata or update,
+        progress=progress.callback,
+        reflink='reflink' in flags or 'reflink=auto' in flags,
+        verify='verify' in flags,
+    )
+    report_copy(flags, src, dst, method)
+    return os.path.getsize(dst)
 
 
 def cp(flags: set, paths: list[str]) -> None:
@@ -19,6 +130,24 @@ def cp(flags: set, paths: list[str]) -> None:
     Args:
         flags: Множество флагов команды:
             - 'r' или 'recursive': для копирования директорий.
+            - 'v' или 'verbose': выводить способ копирования каждого файла.
+            - 'u' или 'update': не копировать файлы, совпадающие в
+              назначении по размеру и времени изменения (с допуском
+              MTIME_TOLERANCE_NS); назначение может существовать.
+              Копирование в уже существующее назначение не попадает в
+              историю undo: прежние версии файлов не сохраняются.
+            - 'delta': как update, но в изменившихся файлах перезаписывать
+              на месте только отличающиеся блоки (у файлов с жёсткими
+              ссылками меняются все ссылки).
+            - 'l' или 'link': создавать жёсткие ссылки вместо копий.
+            - 'reflink' или 'reflink=auto': создавать reflink-копии
+              (ioctl FICLONE на btrfs/XFS), а если файловая система их не
+              поддерживает - обычные копии.
+            - 'verify': считать хеш данных во время копирования (по тем
+              же блокам, без повторного чтения источника) и сверить его
+              с хешем копии, прочитанной с диска после fsync.
+            - 'no-progress': не выводить строку прогресса (она выводится
+              в stderr, только если это терминал).
         paths: Список из двух элементов [источник, назначение]:
             - paths[0]: путь к копируемому файлу/директории.
             - paths[1]: путь назначения (директория или новое имя файла).
@@ -26,24 +155,73 @@ def cp(flags: set, paths: list[str]) -> None:
     Returns:
         None.
 
+    Prints:
+        С флагом -v - способ копирования каждого файла. С флагом -r -
+        число скопированных файлов, объём и скорость копирования.
+        В терминал (stderr) - прогресс: объём, файлы, скорость и
+        оставшееся время.
+
     Raises:
-        IncorrectFlag: Если указан неправильный флаг.
+        IncorrectFlag: Если указан неправильный флаг или несовместимые
+            флаги.
         IncorrectInput: Если количество путей не равно 2.
         PathError: Если исходный путь не существует.
         IsNotFile: Если копируется файл с флагом r/recursive.
         IsNotDirectory: Если копируется директория без флага r/recursive.
-        AlreadyExists: Если целевой файл уже существует.
+        AlreadyExists: Если целевой файл уже существует (без update).
+        ChecksumMismatch: Если копии файлов не совпали с источником
+            (--verify); с -r - если других ошибок не было.
+        shutil.Error: Если с -r часть файлов скопировать не удалось
+            (вместе с копиями, не прошедшими проверку).
+        OSError: Если жёсткую ссылку создать нельзя (например, между
+            файловыми системами).
     """
-    is_correct_flag(flags, {'r', 'recursive'})
+    is_correct_flag(
+        flags,
+        {
+            'r',
+            'recursive',
+            'v',
+            'verbose',
+            'u',
+            'update',
+            'delta',
+            'l',
+            'link',
+            'reflink',
+            'verify',
+            'no-progress',
+        },
+    )
+    check_copy_mode(flags)
     if len(paths) != 2:
         raise IncorrectInput('Неверное количество путей для cp')
     file_path = normalize_path(paths[0])
     file_name = file_path.split(os.sep)[-1]
-    dest_path = resolve_file_path(file_name, paths[1])
-    if flags:
+    update = bool({'u', 'update', 'delta'} & flags)
+    dest_path = resolve_file_path(file_name, paths[1], exist_ok=update)
+    existed = os.path.exists(dest_path)
+    if 'r' in flags or 'recursive' in flags:
         is_correct_directory(file_path)
-        shutil.copytree(file_path, dest_path, dirs_exist_ok=True)
+        start = time.perf_counter()
+        with Progress(flags) as progress:
+            copied, skipped, size = copy_tree(
+                file_path,
+                dest_path,
+                lambda src, dst: copy_one(flags, src, dst, True, progress),
+                progress=progress,
+            )
+        seconds = time.perf_counter() - start
+        rate = human_size(int(size / seconds)) if seconds else '-'
+        print(
+            f'Скопировано файлов: {copied}, пропущено: {skipped}, '
+            f'{human_size(size)} за {seconds:.2f} с ({rate}/с)'
+        )
     else:
         is_correct_file(file_path)
-        shutil.copy(file_path, dest_path)
-    FOR_UNDO_HISTORY.append(['cp', flags, [file_path, dest_path]])
+        with Progress(flags) as progress:
+            progress.add_total(os.path.getsize(file_path))
+            copy_one(flags, file_path, dest_path, False, progress)
+            progress.file_done()
+    if not existed:
+        FOR_UNDO_HISTORY.append(['cp', flags, [file_path, dest_path]])
@@ -0,0 +1,211 @@
+import os
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import src.config.logger
+from src.config.consts import DU_WORKERS
+from src.config.exceptions import IncorrectFlag
+from src.config.functions import (
+    get_int_flag,
+    human_size,
+    is_correct_flag,
+    normalize_path,
+)
+from src.config.output import Output
+
+
+def disk_usage(st: os.stat_result) -> int:
+    """
+    Возвращает место, занимаемое файлом на диске.
+
+    Args:
+        st: Результат stat файла.
+
+    Returns:
+        Число байт в выделенных блоках (или размер файла, если система
+        не сообщает число блоков).
+    """
+    blocks = getattr(st, 'st_blocks', None)
+    return st.st_size if blocks is None else blocks * 512
+
+
+def scan_usage(
+    path: str, seen: set[tuple[int, int]], lock: threading.Lock
+) -> tuple[int, list[tuple[str, int]]]:
+    """
+    Считает место, занятое записями одной директории (без поддиректорий).
+
+    Выполняется в потоке пула. Файлы с несколькими жёсткими ссылками
+    учитываются один раз: (st_dev, st_ino) запоминаются в общем множестве.
+    По символическим ссылкам обход не идёт.
+
+    Args:
+        path: Путь к директории.
+        seen: Уже учтённые inode файлов с жёсткими ссылками.
+        lock: Блокировка для seen.
+
+    Returns:
+        Кортеж (место под файлы, список пар (путь поддиректории, место
+        под её собственную запись)).
+    """
+    total = 0
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append((entry.path, disk_usage(st)))
+                continue
+            if st.st_nlink > 1:
+                key = (st.st_dev, st.st_ino)
+                with lock:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+            total += disk_usage(st)
+    return total, subdirs
+
+
+def format_usage(flags: set, size: int, path: str) -> str:
+    """
+    Форматирует строку вывода du.
+
+    Args:
+        flags: Флаги du ('h'/'human-readable' - размер с единицами).
+        size: Размер в байтах.
+        path: Путь.
+
+    Returns:
+        Строка 'размер<TAB>путь' с переводом строки.
+    """
+    if 'h' in flags or 'human-readable' in flags:
+        return f'{human_size(size)}\t{path}\n'
+    return f'{size}\t{path}\n'
+
+
+def du_tree(
+    flags: set,
+    root: str,
+    max_depth: int | None,
+    pool: ThreadPoolExecutor,
+    seen: set[tuple[int, int]],
+    out: Output,
+) -> int:
+    """
+    Считает место, занятое деревом директорий.
+
+    Каждая директория читается отдельной задачей пула, поэтому задержки
+    stat на сетевых файловых системах перекрываются. Главный поток
+    получает результаты через очередь, запускает задачи для
+    поддиректорий и суммирует размеры снизу вверх: как только все
+    поддиректории директории посчитаны, её итог выводится и прибавляется
+    к родителю. В памяти хранятся только директории, которые ещё
+    не досчитаны.
+
+    Args:
+        flags: Флаги du.
+        root: Путь к корневой директории.
+        max_depth: Максимальная глубина выводимых директорий (None - все).
+        pool: Пул потоков для чтения директорий.
+        seen: Уже учтённые inode файлов с жёсткими ссылками.
+        out: Буферизованный вывод.
+
+    Returns:
+        Место, занятое деревом, в байтах.
+
+    Prints:
+        Итоги директорий по мере их подсчёта.
+    """
+    lock = threading.Lock()
+    results: queue.Queue[tuple[str, Future]] = queue.Queue()
+    sizes = {root: disk_usage(os.lstat(root))}
+    depths = {root: 0}
+    pending: dict[str, int] = {}
+    running = 0
+
+    def submit(path: str) -> None:
+        nonlocal running
+        future = pool.submit(scan_usage, path, seen, lock)
+        future.add_done_callback(lambda f: results.put((path, f)))
+        running += 1
+
+    def finish(path: str) -> None:
+        while True:
+            size = sizes.pop(path)
+            depth = depths.pop(path)
+            del pending[path]
+            if max_depth is None or depth <= max_depth:
+                out.write(format_usage(flags, size, path))
+            if path == root:
+                sizes[root] = size
+                return
+            parent = os.path.dirname(path)
+            sizes[parent] += size
+            pending[parent] -= 1
+            if pending[parent]:
+                return
+            path = parent
+
+    submit(root)
+    while running:
+        path, future = results.get()
+        running -= 1
+        try:
+            own, subdirs = future.result()
+        except OSError:
+            own, subdirs = 0, []
+            out.write(f'Нет прав на чтение {path}\n')
+            src.config.logger.main_logger.error(f'Нет прав на чтение {path}')
+        sizes[path] += own
+        pending[path] = len(subdirs)
+        for subdir, usage in subdirs:
+            sizes[subdir] = usage
+            depths[subdir] = depths[path] + 1
+            submit(subdir)
+        if not subdirs:
+            finish(path)
+    return sizes[root]
+
+
+def du(flags: set, paths: list[str]) -> None:
+    """
+    Выводит место, занятое директориями на диске.
+
+    Args:
+        flags: множество флагов:
+            - 's'/'summarize': только итог для каждого пути.
+            - 'h'/'human-readable': размеры с единицами (K, M, G).
+            - 'depth=N': выводить директории не глубже N уровней.
+        paths: Список путей. Если пустой, то используется текущая
+            директория.
+
+    Prints:
+        Строки 'размер<TAB>путь': сначала поддиректории, затем их
+        родитель.
+
+    Raises:
+        IncorrectFlag: Если указан неверный флаг или значение depth.
+        PathError: Если указанный путь не существует.
+    """
+    is_correct_flag(flags, {'s', 'summarize', 'h', 'human-readable', 'depth'})
+    if 'depth' in flags:
+        raise IncorrectFlag('Не указана глубина: --depth=N')
+    max_depth: int | None = get_int_flag(flags, {'depth'}, -1)
+    if 's' in flags or 'summarize' in flags:
+        max_depth = 0
+    elif max_depth == -1:
+        max_depth = None
+    paths = paths if paths else [os.getcwd()]
+    seen: set[tuple[int, int]] = set()
+    with Output() as out, ThreadPoolExecutor(DU_WORKERS) as pool:
+        for path in paths:
+            path = os.path.normpath(normalize_path(path))
+            if os.path.isdir(path):
+                du_tree(flags, path, max_depth, pool, seen, out)
+            else:
+                size = disk_usage(os.lstat(path))
+                out.write(format_usage(flags, size, path))
@@ -1,67 +1,633 @@
+import multiprocessing
 import os
 import re
+import time
+from collections import deque
+from contextlib import closing
+from functools import partial
+from io import BufferedReader, TextIOWrapper
+from itertools import islice
+from typing import Generator, Iterable, Iterator, cast
 
-from src.config.functions import is_correct_flag, normalize_path
+from src.config.consts import CHUNK_SIZE, POOL_CHUNKSIZE
+from src.config.exceptions import IncorrectFlag
+from src.config.functions import (
+    get_flag_value,
+    get_int_flag,
+    is_binary,
+    is_correct_file,
+    is_correct_flag,
+    normalize_path,
+    walk_files,
+)
+from src.config.logger import main_logger
+from src.config.output import Output
+from src.utilities.archivers import ARCHIVE_EXTENSIONS, iter_members
+from src.utilities.index import find_candidates
 
+REGEX_CHARS = frozenset('.^$*+?{}[]\\|()')
 
-def find_all_files(path: str, files: list | None = None) -> list[str]:
+
+class Matcher:
+    """
+    Паттерн поиска, подготовленный один раз на весь вызов grep.
+
+    Стратегия выбирается по паттерну:
+        - 'literal': поиск подстроки, если в паттерне нет спецсимволов
+          regex или он не компилируется как regex;
+        - 'casefold': поиск подстроки в приведённой к casefold строке (-i);
+        - 'regex': заранее скомпилированное регулярное выражение.
+
+    Attributes:
+        pattern: Исходный паттерн.
+        strategy: Выбранная стратегия поиска.
+        timings: Суммарное время поиска по каждой стратегии, в секундах.
+    """
+
+    def __init__(self, pattern: str, ignore_case: bool = False) -> None:
+        self.pattern = pattern
+        self.regex: re.Pattern | None = None
+        self.needle = pattern.casefold() if ignore_case else pattern
+        self.strategy = 'casefold' if ignore_case else 'literal'
+        self.timings: dict[str, float] = {}
+        if not REGEX_CHARS.isdisjoint(pattern):
+            flag = re.IGNORECASE if ignore_case else 0
+            try:
+                self.regex = re.compile(pattern, flag)
+                self.strategy = 'regex'
+            except re.error:
+                pass
+
+    def search(self, row: str) -> bool:
+        """
+        Проверяет, содержит ли строка паттерн.
+
+        Args:
+            row: Строка для проверки.
+
+        Returns:
+            True, если паттерн найден.
+        """
+        if self.regex is not None:
+            return self.regex.search(row) is not None
+        if self.strategy == 'casefold':
+            return row.casefold().find(self.needle) != -1
+        return self.needle in row
+
+    def literals(self) -> list[str] | None:
+        """
+        Возвращает подстроки, одна из которых обязана быть в совпадении.
+
+        Используется для отбора файлов по триграммному индексу. Индекс
+        приводит к нижнему регистру только ASCII, поэтому паттерн не из
+        ASCII не используется: с -i casefold сопоставляет ему другие байты
+        (ß и ss, Ä и ä). Совпадения ASCII-паттерна с буквами не из ASCII
+        (знак Кельвина для k) индекс не находит.
+
+        Returns:
+            Список подстрок или None, если паттерн - регулярное выражение
+            или не из ASCII.
+        """
+        if self.regex is not None or not self.pattern.isascii():
+            return None
+        return [self.pattern]
+
+    def add_time(self, seconds: float) -> None:
+        """
+        Добавляет время поиска к счётчику текущей стратегии.
+
+        Args:
+            seconds: Затраченное время в секундах.
+        """
+        self.timings[self.strategy] = (
+            self.timings.get(self.strategy, 0.0) + seconds
+        )
+
+    def label(self, row: str) -> str:
+        """
+        Возвращает пометку совпадения для вывода.
+
+        Для одного паттерна пометка не нужна.
+
+        Args:
+            row: Совпавшая строка.
+
+        Returns:
+            Пустая строка.
+        """
+        return ''
+
+
+class MultiMatcher(Matcher):
     """
-    Рекурсивно находит все файлы в директории.
+    Набор паттернов, по возможности объединённый в одно регулярное
+    выражение.
+
+    Каждый паттерн становится именованной альтернативой, поэтому файл
+    просматривается один раз для всех паттернов. Паттерны без
+    спецсимволов regex и некомпилируемые паттерны ищутся как подстроки.
+    Если объединение меняет смысл паттернов (в них есть группы, и
+    номера групп и обратные ссылки сдвинутся) или не компилируется
+    (например, глобальные флаги вида (?i) не в начале), паттерны
+    проверяются по отдельности (стратегия 'multi-separate').
+
+    Attributes:
+        patterns: Исходные паттерны без повторов и пустых строк.
+        regexes: Скомпилированные по отдельности паттерны.
+        combined: Объединённое выражение или None.
+    """
+
+    def __init__(self, patterns: list[str], ignore_case: bool = False) -> None:
+        self.patterns = list(dict.fromkeys(p for p in patterns if p))
+        self.all_literal = True
+        flag = re.IGNORECASE if ignore_case else 0
+        self.regexes: list[re.Pattern] = []
+        parts = []
+        for i, pattern in enumerate(self.patterns):
+            part = re.escape(pattern)
+            if not REGEX_CHARS.isdisjoint(pattern):
+                try:
+                    re.compile(pattern)
+                    part = pattern
+                    self.all_literal = False
+                except re.error:
+                    pass
+            self.regexes.append(re.compile(part, flag))
+            parts.append(f'(?P<p{i}>{part})')
+        self.pattern = '|'.join(parts)
+        self.needle = '\n'.join(self.patterns)
+        self.strategy = 'multi'
+        self.timings = {}
+        self.combined: re.Pattern | None = None
+        if all(regex.groups == 0 for regex in self.regexes):
+            try:
+                self.combined = re.compile(self.pattern, flag)
+            except re.error:
+                pass
+        if self.combined is None:
+            self.strategy = 'multi-separate'
+        self.regex = self.combined
+
+    def search(self, row: str) -> bool:
+        """
+        Проверяет, содержит ли строка хотя бы один из паттернов.
+
+        Args:
+            row: Строка для проверки.
+
+        Returns:
+            True, если какой-либо паттерн найден.
+        """
+        if self.combined is not None:
+            return self.combined.search(row) is not None
+        return any(regex.search(row) for regex in self.regexes)
+
+    def literals(self) -> list[str] | None:
+        """
+        Возвращает паттерны, если все они ищутся как подстроки.
+
+        Как и в Matcher.literals, паттерны не из ASCII не используются.
+
+        Returns:
+            Список паттернов или None, если среди них есть regex или
+            паттерн не из ASCII.
+        """
+        if not self.all_literal or not self.needle.isascii():
+            return None
+        return self.patterns
+
+    def label(self, row: str) -> str:
+        """
+        Возвращает список совпавших в строке паттернов.
+
+        Каждый паттерн проверяется на строке отдельно, поэтому в пометку
+        попадают и пересекающиеся совпадения (foo и foobar в 'foobar').
+        Вызывается только для совпавших строк.
+
+        Args:
+            row: Совпавшая строка.
+
+        Returns:
+            Пометка вида '[паттерн1, паттерн2] '.
+        """
+        hits = [
+            pattern
+            for pattern, regex in zip(self.patterns, self.regexes, strict=True)
+            if regex.search(row)
+        ]
+        return f'[{", ".join(hits)}] '
+
+
+def read_patterns(path: str) -> list[str]:
+    """
+    Читает паттерны из файла, по одному на строку.
 
     Args:
-        path: Путь к директории для поиска.
-        files: файлы текущей директории (используется для рекурсии).
+        path: Путь к файлу паттернов.
 
     Returns:
-        files: Список абсолютных путей ко всем файлам в директории.
-    """
-    if not files:
-        files = []
-    for file in os.listdir(path):
-        file = os.path.join(path, file)
-        if os.path.isdir(file):
-            files.extend(find_all_files(file))
+        Список паттернов.
+
+    Raises:
+        PathError: Если файл не существует.
+        IsNotFile: Если путь не является файлом.
+    """
+    path = normalize_path(path)
+    is_correct_file(path)
+    with open(path, 'r') as f:
+        return f.read().splitlines()
+
+
+def iter_matches(
+    stream: BufferedReader, matcher: Matcher, flags: set
+) -> Generator[tuple[int, str], None, None]:
+    """
+    Лениво ищет паттерн в потоке и отдаёт совпадающие строки с номерами.
+
+    Файл читается блоками по CHUNK_SIZE байт и разбирается построчно,
+    поэтому память не зависит от размера файла, а первое совпадение
+    отдаётся сразу, как только найдено. Если потребитель прекращает
+    итерацию, дальше файл не читается. Некорректные для UTF-8 байты
+    заменяются на U+FFFD.
+
+    Двоичные файлы (с NUL в начале) по умолчанию просматриваются
+    кусками по CHUNK_SIZE символов до первого совпадения; к куску
+    приписывается хвост предыдущего длиной len(pattern) - 1, чтобы не
+    терять совпадения на границе кусков (для regex это покрывает
+    совпадения не длиннее самого паттерна). С флагом 'I' они
+    пропускаются без чтения, с 'text' - ищутся как текстовые. В обоих
+    случаях поиск идёт по декодированному тексту, а не по сырым байтам:
+    байты, некорректные для UTF-8, становятся U+FFFD.
+
+    Args:
+        stream: Открытый на чтение поток файла или члена архива.
+        matcher: Подготовленный паттерн поиска.
+        flags: Набор флагов grep.
+
+    Yields:
+        Кортежи (номер строки, строка); для двоичного файла - один
+        кортеж (0, '').
+    """
+    if not matcher.pattern:
+        return
+    binary = 'text' not in flags and is_binary(stream)
+    if binary and 'I' in flags:
+        return
+    search = matcher.search
+    f = TextIOWrapper(stream, encoding='utf-8', errors='replace')
+    if binary:
+        overlap = len(matcher.pattern) - 1
+        tail = ''
+        for piece in iter(partial(f.readline, CHUNK_SIZE), ''):
+            if search(tail + piece):
+                yield 0, ''
+                return
+            if piece.endswith('\n') or not overlap:
+                tail = ''
+            else:
+                tail = (tail + piece)[-overlap:]
+        return
+    for n, row in enumerate(f, start=1):
+        if search(row):
+            yield n, row
+
+
+def get_context(flags: set) -> tuple[int, int]:
+    """
+    Определяет число строк контекста до и после совпадения.
+
+    Args:
+        flags: Набор флагов grep.
+
+    Returns:
+        Кортеж (строк до, строк после).
+
+    Raises:
+        IncorrectFlag: Если значение флага контекста не указано или неверно.
+    """
+    if {'A', 'B', 'C', 'after-context', 'before-context', 'context'} & flags:
+        raise IncorrectFlag('Не указано число строк контекста: -C=N')
+    context = get_int_flag(flags, {'C', 'context'}, 0)
+    before = get_int_flag(flags, {'B', 'before-context'}, context)
+    after = get_int_flag(flags, {'A', 'after-context'}, context)
+    return before, after
+
+
+def iter_context(
+    stream: BufferedReader, matcher: Matcher, flags: set, limit: int | None
+) -> Generator[tuple[int, str, bool], None, None]:
+    """
+    Лениво отдаёт совпадения вместе со строками контекста.
+
+    Строки до совпадения хранятся в кольцевом буфере на B строк, строки
+    после совпадения отдаются сразу, поэтому файл читается один раз и
+    целиком в памяти не держится. После limit совпадений отдаётся
+    контекст после последнего из них и чтение прекращается.
+
+    Args:
+        stream: Открытый на чтение поток файла или члена архива.
+        matcher: Подготовленный паттерн поиска.
+        flags: Набор флагов grep.
+        limit: Максимальное число совпадений или None.
+
+    Yields:
+        Кортежи (номер строки, строка, совпадение ли это). Разрыв между
+        группами строк обозначается кортежем (0, '', False), двоичный
+        файл с совпадением - кортежем (0, '', True).
+    """
+    if not matcher.pattern:
+        return
+    if 'text' not in flags and is_binary(stream):
+        for n, row in iter_matches(stream, matcher, flags):
+            yield n, row, True
+        return
+    before_count, after_count = get_context(flags)
+    before: deque[tuple[int, str]] = deque(maxlen=before_count)
+    after_left = printed = 0
+    remaining = limit
+    search = matcher.search
+    f = TextIOWrapper(stream, encoding='utf-8', errors='replace')
+    for n, row in enumerate(f, start=1):
+        if remaining != 0 and search(row):
+            first = before[0][0] if before else n
+            if printed and first > printed + 1:
+                yield 0, '', False
+            for before_n, before_row in before:
+                yield before_n, before_row, False
+            before.clear()
+            yield n, row, True
+            printed = n
+            after_left = after_count
+            if remaining is not None:
+                remaining -= 1
+        elif after_left:
+            yield n, row, False
+            printed = n
+            after_left -= 1
+        elif remaining == 0:
+            break
+        else:
+            before.append((n, row))
+
+
+def get_max_count(flags: set) -> int | None:
+    """
+    Определяет, после скольких совпадений прекратить чтение файла.
+
+    Для 'l' и 'q' достаточно первого совпадения.
+
+    Args:
+        flags: Набор флагов grep.
+
+    Returns:
+        Число совпадений или None, если ограничения нет.
+
+    Raises:
+        IncorrectFlag: Если значение 'm'/'max-count' не указано или неверно.
+    """
+    if 'm' in flags or 'max-count' in flags:
+        raise IncorrectFlag('Не указано число совпадений: -m=N')
+    if {'l', 'files-with-matches', 'q', 'quiet'} & flags:
+        return 1
+    max_count = get_int_flag(flags, {'m', 'max-count'}, 0)
+    return max_count or None
+
+
+def format_matches(
+    path: str, stream: BufferedReader, matcher: Matcher, flags: set
+) -> Iterator[str]:
+    """
+    Ищет паттерн в потоке и отдаёт строки вывода по режиму grep.
+
+    Режимы:
+        - по умолчанию: совпадающие строки с номерами;
+        - 'A'/'B'/'C': совпадающие строки со строками контекста
+          ('путь- номер строка') и разделителем '--' между группами;
+        - 'l'/'files-with-matches': только путь к файлу с совпадением;
+        - 'c'/'count': число совпадающих строк.
+
+    Чтение файла прекращается после get_max_count совпадений.
+
+    Args:
+        path: Имя файла для вывода.
+        stream: Открытый на чтение поток файла или члена архива.
+        matcher: Подготовленный паттерн поиска.
+        flags: Набор флагов grep.
+
+    Yields:
+        Строки вывода в формате 'путь: номер строка'
+        (для нескольких паттернов 'путь: номер [паттерны] строка').
+    """
+    before, after = get_context(flags)
+    is_listing = {'l', 'files-with-matches', 'c', 'count'} & flags
+    if (before or after) and not is_listing:
+        with closing(
+            iter_context(stream, matcher, flags, get_max_count(flags))
+        ) as lines:
+            for n, row, matched in lines:
+                if n and matched:
+                    yield f'{path}: {n} {matcher.label(row)}{row}'
+                elif n:
+                    yield f'{path}- {n} {row}'
+                elif matched:
+                    yield f'Двоичный файл {path} совпадает\n'
+                else:
+                    yield '--\n'
+        return
+    with closing(iter_matches(stream, matcher, flags)) as found:
+        matches = islice(found, get_max_count(flags))
+        if 'l' in flags or 'files-with-matches' in flags:
+            if next(matches, None) is not None:
+                yield f'{path}\n'
+        elif 'c' in flags or 'count' in flags:
+            yield f'{path}: {sum(1 for _ in matches)}\n'
         else:
-            files.append(file)
-    return files
+            for n, row in matches:
+                if n:
+                    yield f'{path}: {n} {matcher.label(row)}{row}'
+                else:
+                    yield f'Двоичный файл {path} совпадает\n'
 
 
-def find_in_file(path: str, pattern: str, flags: set) -> None:
+def iter_sources(
+    path: str, flags: set
+) -> Generator[tuple[str, BufferedReader], None, None]:
     """
-    Ищет pattern в файле и выводит совпадающие строки с номерами.
+    Открывает файл для поиска или, с флагом 'archives', файлы архива.
 
-    Поддерживает регулярные выражения и простой поиск подстроки.
+    Члены архивов .zip и .tar[.gz|.bz|.xz] распаковываются на лету,
+    без записи на диск, и называются 'архив!путь/внутри'.
+
+    Args:
+        path: Путь к файлу.
+        flags: Набор флагов grep.
+
+    Yields:
+        Кортежи (имя для вывода, открытый поток).
+    """
+    if 'archives' in flags and path.endswith(ARCHIVE_EXTENSIONS):
+        for name, member in iter_members(path):
+            yield f'{path}!{name}', member
+        return
+    with open(path, 'rb', buffering=CHUNK_SIZE) as stream:
+        yield path, cast(BufferedReader, stream)
+
+
+def has_match(path: str, matcher: Matcher, flags: set) -> bool:
+    """
+    Проверяет, есть ли в файле совпадение, читая его до первого из них.
 
     Args:
         path: Путь к файлу для поиска.
-        pattern: Паттерн поиска (может быть regex или строка).
-        Должен быть записан в кавычках.
-        flags: Набор флагов ('i'/'ignore-case' для поиска без учета регистра,
-                            'r'/'recursive' для рекурсивного поиска).
+        matcher: Подготовленный паттерн поиска.
+        flags: Набор флагов grep.
+
+    Returns:
+        True, если совпадение найдено.
+    """
+    with closing(iter_sources(path, flags)) as sources:
+        for _, stream in sources:
+            with closing(iter_matches(stream, matcher, flags)) as found:
+                if next(found, None) is not None:
+                    return True
+    return False
+
+
+def search_path(path: str, matcher: Matcher, flags: set) -> Iterator[str]:
+    """
+    Ищет паттерн в файле или во всех файлах архива.
+
+    Args:
+        path: Путь к файлу для поиска.
+        matcher: Подготовленный паттерн поиска.
+        flags: Набор флагов grep.
+
+    Yields:
+        Строки вывода format_matches.
+    """
+    with closing(iter_sources(path, flags)) as sources:
+        for name, stream in sources:
+            yield from format_matches(name, stream, matcher, flags)
+
+
+def search_file(
+    path: str, matcher: Matcher, flags: set
+) -> tuple[list[str], float]:
+    """
+    Ищет паттерн в файле и возвращает все совпадающие строки.
+
+    Используется процессами пула, которым нужно вернуть результат целиком.
+
+    Args:
+        path: Путь к файлу для поиска.
+        matcher: Подготовленный паттерн поиска.
+        flags: Набор флагов grep.
+
+    Returns:
+        Кортеж (строки вывода, время поиска в секундах).
+    """
+    start = time.perf_counter()
+    found = list(search_path(path, matcher, flags))
+    return found, time.perf_counter() - start
 
-    Prints:
-        Строки, содержащие pattern с номерами.
 
+def find_in_file(path: str, matcher: Matcher, flags: set, out: Output) -> None:
     """
-    flag = re.IGNORECASE if ('i' in flags or 'ignore-case' in flags) else 0
+    Ищет паттерн в файле и выводит совпадающие строки по мере нахождения.
+
+    Args:
+        path: Путь к файлу для поиска.
+        matcher: Подготовленный паттерн поиска.
+        flags: Набор флагов grep.
+        out: Буферизованный вывод.
+
+    Prints:
+        Строки, содержащие паттерн, с номерами.
+    """
+    start = time.perf_counter()
     try:
-        re.compile(pattern, flag)
-        reg = True
-    except re.error:
-        reg = False
-    with open(path, 'r') as f:
-        for n, row in enumerate(f.readlines(), start=1):
-            if pattern and reg and re.search(pattern, row, flag):
-                print(f'{path}: {n} {row}', end='')
-            elif pattern and not reg:
-                if flag:
-                    pattern = pattern.lower()
-                    row = row.lower()
-                if pattern in row:
-                    print(f'{path}: {n} {row}', end='')
+        for line in search_path(path, matcher, flags):
+            out.write(line)
+    finally:
+        matcher.add_time(time.perf_counter() - start)
+
+
+def get_jobs(flags: set) -> int:
+    """
+    Определяет число процессов для поиска.
 
+    Флаг без значения (-j, --jobs) означает число ядер процессора.
 
-def grep(flags: set, paths: list) -> None:
+    Args:
+        flags: Набор флагов grep.
+
+    Returns:
+        Число процессов (1 - последовательный поиск).
+    """
+    if 'j' in flags or 'jobs' in flags:
+        return os.cpu_count() or 1
+    return max(get_int_flag(flags, {'j', 'jobs'}, 1), 1)
+
+
+def iter_files(
+    paths: list[str], flags: set, matcher: Matcher
+) -> Iterator[str]:
+    """
+    Лениво отдаёт файлы для поиска.
+
+    Директории обходятся по мере потребления, поэтому поиск начинается
+    до окончания обхода дерева.
+
+    Args:
+        paths: Нормализованные пути из ввода.
+        flags: Набор флагов grep.
+        matcher: Подготовленный паттерн поиска (нужен для индекса).
+
+    Yields:
+        Пути к файлам.
+    """
+    exclude = get_flag_value(flags, {'exclude'})
+    ignore = exclude.split(',') if exclude else []
+    for path in paths:
+        if os.path.isdir(path) and 'indexed' in flags:
+            yield from find_candidates(
+                os.path.abspath(path), matcher.literals(), 'rescan' in flags
+            )
+        elif os.path.isdir(path) and ('r' in flags or 'recursive' in flags):
+            yield from walk_files(path, ignore)
+        else:
+            yield path
+
+
+def parallel_search(
+    files: Iterable[str], matcher: Matcher, flags: set, jobs: int, out: Output
+) -> None:
+    """
+    Ищет pattern в файлах пулом процессов.
+
+    Файлы раздаются процессам пачками по мере обхода, результаты
+    выводятся в исходном порядке файлов, строки одного файла печатаются
+    вместе.
+
+    Args:
+        files: Файлы для поиска.
+        matcher: Подготовленный паттерн поиска.
+        flags: Набор флагов grep.
+        jobs: Число процессов.
+        out: Буферизованный вывод.
+
+    Prints:
+        Строки, содержащие pattern с номерами.
+    """
+    worker = partial(search_file, matcher=matcher, flags=flags)
+    with multiprocessing.Pool(jobs) as pool:
+        for found, seconds in pool.imap(worker, files, POOL_CHUNKSIZE):
+            matcher.add_time(seconds)
+            for line in found:
+                out.write(line)
+
+
+def grep(flags: set, paths: list) -> bool | None:
     """
     Ищет паттерн в файлах.
 
@@ -71,26 +637,105 @@ def grep(flags: set, paths: list) -> None:
         flags: множество флагов:
             - 'r'/'recursive': рекурсивный поиск в поддиректориях
             - 'i'/'ignore-case': поиск без учета регистра
-        paths: Список паттерн + пути для поиска
+            - 'j'/'jobs'[=N]: параллельный поиск в N процессах
+              (без значения - по числу ядер)
+            - 'stats': вывод выбранной стратегии поиска и её времени
+            - 'f'/'file'=PATH: паттерны из файла, по одному на строку
+            - 'indexed': поиск в директориях по триграммному индексу
+              (строится командой index build)
+            - 'rescan': с 'indexed' проверять mtime и размер каждого
+              файла, а не только директорий (находит файлы, изменённые на
+              месте)
+            - 'I': пропускать двоичные файлы
+            - 'text': искать в двоичных файлах как в текстовых
+            - 'archives': искать внутри архивов .zip/.tar* без распаковки
+              на диск, совпадения выводятся как 'архив!путь'
+            - 'exclude'=PATTERNS: пропускать при рекурсивном обходе имена,
+              подходящие под шаблоны через запятую (.git,node_modules)
+            - 'l'/'files-with-matches': вывод только имён файлов
+            - 'c'/'count': вывод числа совпадающих строк в каждом файле
+            - 'm'/'max-count'=N: не больше N совпадений на файл
+            - 'q'/'quiet': ничего не выводить, остановиться на первом
+              совпадении; результат - код завершения в приглашении
+              оболочки
+            - 'A'/'after-context'=N, 'B'/'before-context'=N,
+              'C'/'context'=N: вывод N строк контекста после/до/вокруг
+              совпадения
+        paths: Список паттерн + пути для поиска (с 'f'/'file' - только пути)
 
     Prints:
         строки, содержащие pattern с номерами
 
+    Returns:
+        С флагом 'q'/'quiet' - True, если совпадение найдено, иначе False
+        (main превращает False в код завершения 1); без него - None.
+
     Raises:
         IncorrectFlag: Если указан неверный флаг
         PathError: Если указан несуществующий файл
+        IndexNotFound: Если для директории с 'indexed' не построен индекс
     """
-    is_correct_flag(flags, {'r', 'i', 'ignore-case', 'recursive'})
-    pattern = ''
-    if not os.path.exists(paths[0]):
-        pattern = paths[0]
-        paths = paths[1:]
-    all_files = []
-    for path in paths:
-        path = normalize_path(path)
-        if os.path.isdir(path) and ('r' in flags or 'recursive' in flags):
-            all_files.extend(find_all_files(path))
+    is_correct_flag(
+        flags,
+        {
+            'r',
+            'recursive',
+            'i',
+            'ignore-case',
+            'j',
+            'jobs',
+            'f',
+            'file',
+            'stats',
+            'indexed',
+            'rescan',
+            'exclude',
+            'I',
+            'text',
+            'l',
+            'files-with-matches',
+            'c',
+            'count',
+            'm',
+            'max-count',
+            'q',
+            'quiet',
+            'A',
+            'after-context',
+            'B',
+            'before-context',
+            'C',
+            'context',
+            'archives',
+        },
+    )
+    if 'f' in flags or 'file' in flags:
+        raise IncorrectFlag('Не указан файл паттернов: -f=PATH')
+    get_max_count(flags)
+    get_context(flags)
+    jobs = get_jobs(flags)
+    ignore_case = 'i' in flags or 'ignore-case' in flags
+    pattern_file = get_flag_value(flags, {'f', 'file'})
+    matcher: Matcher
+    if pattern_file is not None:
+        matcher = MultiMatcher(read_patterns(pattern_file), ignore_case)
+    else:
+        pattern = ''
+        if not os.path.exists(paths[0]):
+            pattern = paths[0]
+            paths = paths[1:]
+        matcher = Matcher(pattern, ignore_case)
+    files = iter_files([normalize_path(p) for p in paths], flags, matcher)
+    if 'q' in flags or 'quiet' in flags:
+        return any(has_match(file, matcher, flags) for file in files)
+    with Output() as out:
+        if jobs > 1:
+            parallel_search(files, matcher, flags, jobs, out)
         else:
-            all_files.append(path)
-    for file in all_files:
-        find_in_file(file, pattern, flags)
+            for file in files:
+                find_in_file(file, matcher, flags, out)
+        for strategy, seconds in matcher.timings.items():
+            main_logger.info(f'grep: стратегия {strategy}, {seconds:.6f} с')
+            if 'stats' in flags:
+                out.write(f'Стратегия: {strategy}, время: {seconds:.6f} с\n')
+    return None
@@ -0,0 +1,90 @@
+from typing import BinaryIO
+
+from src.config.consts import CHUNK_SIZE, DEFAULT_LINES
+from src.config.exceptions import IncorrectFlag, IncorrectInput
+from src.config.functions import (
+    get_int_flag,
+    is_correct_file,
+    is_correct_flag,
+    normalize_path,
+)
+from src.utilities.cat import end_line, write_range
+
+
+def get_lines(flags: set) -> int:
+    """
+    Возвращает число строк из флага -n=N/--lines=N.
+
+    Args:
+        flags: Флаги head/tail.
+
+    Returns:
+        Число строк (по умолчанию DEFAULT_LINES).
+
+    Raises:
+        IncorrectFlag: Если значение 'n'/'lines' не указано или неверно.
+    """
+    if 'n' in flags or 'lines' in flags:
+        raise IncorrectFlag('Не указано число строк: -n=N')
+    return get_int_flag(flags, {'n', 'lines'}, DEFAULT_LINES)
+
+
+def find_head_end(f: BinaryIO, count: int) -> int:
+    """
+    Находит конец первых count строк файла.
+
+    Файл читается с начала блоками по CHUNK_SIZE байт, переводы строк
+    считаются bytes.count, поэтому читается только нужная часть файла.
+
+    Args:
+        f: Файл, открытый в бинарном режиме.
+        count: Число строк.
+
+    Returns:
+        Смещение сразу после count-го перевода строки или размер файла,
+        если строк меньше.
+    """
+    pos = 0
+    f.seek(0)
+    while count and (chunk := f.read(CHUNK_SIZE)):
+        found = chunk.count(b'\n')
+        if found >= count:
+            index = -1
+            for _ in range(count):
+                index = chunk.index(b'\n', index + 1)
+            return pos + index + 1
+        count -= found
+        pos += len(chunk)
+    return pos
+
+
+def head(flags: set, paths: list[str]) -> None:
+    """
+    Выводит первые строки файлов.
+
+    Args:
+        flags: множество флагов:
+            - 'n=N'/'lines=N': число строк (по умолчанию 10).
+        paths: Список путей. Должен содержать хотя бы один файл.
+
+    Prints:
+        Первые строки файлов; для нескольких файлов перед каждым
+        выводится заголовок '==> путь <=='.
+
+    Raises:
+        IncorrectFlag: Если указан неверный флаг или число строк.
+        IncorrectInput: Если список paths пуст.
+        PathError: Если указанный путь не существует.
+        IsNotFile: Если путь указывает на директорию.
+    """
+    is_correct_flag(flags, {'n', 'lines'})
+    count = get_lines(flags)
+    if not paths:
+        raise IncorrectInput('Не указан файл для чтения')
+    for file in paths:
+        path = normalize_path(file)
+        is_correct_file(path)
+        if len(paths) > 1:
+            print(f'==> {file} <==')
+        with open(path, 'rb', buffering=CHUNK_SIZE) as f:
+            end_line(write_range(f, 0, find_head_end(f, count)))
@@ -0,0 +1,435 @@
+import hashlib
+import multiprocessing
+import os
+import pickle
+import sys
+from array import array
+from collections.abc import Iterator
+
+import src.config.consts
+from src.config.consts import CHUNK_SIZE, INDEX_PARALLEL_MIN, POOL_CHUNKSIZE
+from src.config.exceptions import IncorrectFlag, IncorrectInput, IndexNotFound
+from src.config.functions import (
+    is_correct_directory,
+    normalize_path,
+    scan_tree,
+    walk_files,
+)
+
+
+def index_file_path(root: str) -> str:
+    """
+    Возвращает путь к файлу индекса для директории.
+
+    Args:
+        root: Абсолютный путь к индексируемой директории.
+
+    Returns:
+        Путь к файлу индекса в ~/.grep_index.
+    """
+    name = hashlib.sha1(root.encode('utf-8', 'surrogateescape')).hexdigest()
+    return os.path.join(src.config.consts.INDEX_PATH, f'{name}.pickle')
+
+
+def file_trigrams(path: str) -> set[bytes]:
+    """
+    Собирает множество триграмм файла.
+
+    Файл читается блоками по CHUNK_SIZE байт с перекрытием в два байта,
+    чтобы не терять триграммы на границах блоков. Регистр ASCII-символов
+    не учитывается. Триграммы блока собираются в C-цикле
+    zip(data, data[1:], data[2:]) в виде кортежей чисел, а в bytes
+    переводятся только различные триграммы файла.
+
+    Args:
+        path: Путь к файлу.
+
+    Returns:
+        Множество триграмм (по 3 байта).
+    """
+    trigrams: set[tuple[int, int, int]] = set()
+    tail = b''
+    with open(path, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            data = tail + chunk.lower()
+            trigrams.update(zip(data, data[1:], data[2:], strict=False))
+            tail = data[-2:]
+    return {bytes(trigram) for trigram in trigrams}
+
+
+def read_trigrams(path: str) -> set[bytes] | None:
+    """
+    Собирает триграммы файла в процессе пула.
+
+    Args:
+        path: Путь к файлу.
+
+    Returns:
+        Множество триграмм или None, если файл не прочитан.
+    """
+    try:
+        return file_trigrams(path)
+    except OSError:
+        return None
+
+
+def iter_trigrams(paths: list[str]) -> Iterator[set[bytes] | None]:
+    """
+    Лениво собирает триграммы файлов в порядке paths.
+
+    Если файлов не меньше INDEX_PARALLEL_MIN, они читаются пулом
+    процессов по числу ядер, иначе в текущем процессе.
+
+    Args:
+        paths: Пути к файлам.
+
+    Yields:
+        Множество триграмм каждого файла или None, если он не прочитан.
+    """
+    if len(paths) < INDEX_PARALLEL_MIN:
+        yield from map(read_trigrams, paths)
+        return
+    with multiprocessing.Pool() as pool:
+        yield from pool.imap(read_trigrams, paths, POOL_CHUNKSIZE)
+
+
+def load_index(root: str) -> dict | None:
+    """
+    Загружает индекс директории с диска.
+
+    Args:
+        root: Абсолютный путь к индексированной директории.
+
+    Returns:
+        Индекс или None, если он не построен.
+    """
+    try:
+        with open(index_file_path(root), 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_index(data: dict) -> None:
+    """
+    Атомарно сохраняет индекс на диск.
+
+    Args:
+        data: Индекс директории.
+    """
+    os.makedirs(src.config.consts.INDEX_PATH, exist_ok=True)
+    path = index_file_path(data['root'])
+    with open(f'{path}.tmp', 'wb') as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f'{path}.tmp', path)
+
+
+def build_index(root: str) -> tuple[int, int]:
+    """
+    Строит или инкрементально обновляет триграммный индекс директории.
+
+    Индекс хранит для каждого файла (mtime_ns, размер, id), для каждой
+    директории - её mtime_ns, а для каждой триграммы - отсортированный
+    массив id файлов, в которых она есть.
+    Файлы с неизменными mtime и размером повторно не читаются, id
+    изменённых и удалённых файлов вычищаются из списков. Изменённые
+    файлы читаются через iter_trigrams.
+
+    Args:
+        root: Абсолютный путь к директории.
+
+    Returns:
+        Кортеж (число файлов в индексе, число переиндексированных файлов).
+    """
+    data = load_index(root) or {
+        'root': root,
+        'files': {},
+        'postings': {},
+        'next_id': 0,
+    }
+    old_files: dict[str, tuple[int, int, int]] = data['files']
+    files: dict[str, tuple[int, int, int]] = {}
+    dirs: dict[str, int] = {}
+    changed = []
+    for directory, entries in scan_tree(root, follow_symlinks=True):
+        try:
+            dirs[directory] = os.stat(directory).st_mtime_ns
+        except OSError:
+            continue
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            old = old_files.get(entry.path)
+            if old and old[:2] == (st.st_mtime_ns, st.st_size):
+                files[entry.path] = old
+            else:
+                changed.append((entry.path, st.st_mtime_ns, st.st_size))
+    stale = {old[2] for path, old in old_files.items() if path not in files}
+    postings: dict[bytes, array] = data['postings']
+    if stale:
+        for trigram in list(postings):
+            ids = array('I', (i for i in postings[trigram] if i not in stale))
+            if ids:
+                postings[trigram] = ids
+            else:
+                del postings[trigram]
+    next_id = data['next_id']
+    results = iter_trigrams([path for path, _, _ in changed])
+    for (path, mtime_ns, size), trigrams in zip(changed, results, strict=True):
+        if trigrams is None:
+            continue
+        for trigram in trigrams:
+            postings.setdefault(trigram, array('I')).append(next_id)
+        files[path] = (mtime_ns, size, next_id)
+        next_id += 1
+    data['files'] = files
+    data['dirs'] = dirs
+    data['next_id'] = next_id
+    save_index(data)
+    return len(files), len(changed)
+
+
+def find_index(path: str) -> dict | None:
+    """
+    Ищет индекс для директории или ближайшей её родительской директории.
+
+    Args:
+        path: Абсолютный путь к директории.
+
+    Returns:
+        Найденный индекс или None.
+    """
+    while True:
+        if os.path.exists(index_file_path(path)):
+            return load_index(path)
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def match_ids(postings: dict[bytes, array], needle: bytes) -> set[int]:
+    """
+    Возвращает id файлов, содержащих все триграммы подстроки.
+
+    Списки пересекаются начиная с самого короткого.
+
+    Args:
+        postings: Списки id файлов по триграммам.
+        needle: Подстрока длиной не меньше трёх байт.
+
+    Returns:
+        Множество id файлов.
+    """
+    lists = sorted(
+        (
+            postings.get(needle[i : i + 3], array('I'))
+            for i in range(len(needle) - 2)
+        ),
+        key=len,
+    )
+    ids = set(lists[0])
+    for posting in lists[1:]:
+        if not ids:
+            break
+        ids.intersection_update(posting)
+    return ids
+
+
+def rescan_files(
+    path: str, files: dict[str, tuple[int, int, int]], ids: set[int] | None
+) -> tuple[list[str], int]:
+    """
+    Отбирает кандидатов, проверяя mtime и размер каждого файла.
+
+    Директория обходится целиком (без чтения файлов), поэтому проверка
+    стоит O(числа файлов) вызовов stat, но находит и файлы, изменённые
+    на месте.
+
+    Args:
+        path: Абсолютный путь к директории.
+        files: Файлы индекса.
+        ids: id файлов, подходящих по триграммам, или None (все файлы).
+
+    Returns:
+        Кортеж (кандидаты, число новых и изменённых файлов).
+    """
+    candidates = []
+    stale = 0
+    for file in walk_files(path):
+        indexed = files.get(file)
+        if indexed is not None and (ids is None or indexed[2] in ids):
+            candidates.append(file)
+            continue
+        try:
+            st = os.stat(file)
+        except OSError:
+            continue
+        if indexed is None or indexed[:2] != (st.st_mtime_ns, st.st_size):
+            candidates.append(file)
+            stale += 1
+    return candidates, stale
+
+
+def changed_dir_files(
+    path: str, data: dict, ids: set[int] | None
+) -> tuple[list[str], int]:
+    """
+    Отбирает кандидатов, проверяя только mtime директорий.
+
+    Вызовы stat делаются для директорий индекса; читаются и проверяются
+    по mtime и размеру только файлы директорий, mtime которых изменился
+    (в них создавали, удаляли или переименовывали файлы, в том числе при
+    сохранении через замену файла). Новые поддиректории обходятся
+    целиком. Файл, изменённый на месте в неизменённой директории, не
+    обнаруживается - для этого нужна полная проверка rescan_files.
+
+    Args:
+        path: Абсолютный путь к директории.
+        data: Индекс с mtime директорий.
+        ids: id файлов, подходящих по триграммам, или None (все файлы).
+
+    Returns:
+        Кортеж (кандидаты, число новых и изменённых файлов).
+    """
+    files: dict[str, tuple[int, int, int]] = data['files']
+    dirs: dict[str, int] = data['dirs']
+    prefix = os.path.join(path, '')
+    gone: set[str] = set()
+    listings: dict[str, list[os.DirEntry]] = {}
+    for directory, mtime_ns in dirs.items():
+        if directory != path and not directory.startswith(prefix):
+            continue
+        try:
+            if os.stat(directory).st_mtime_ns == mtime_ns:
+                continue
+            with os.scandir(directory) as it:
+                listings[directory] = list(it)
+        except OSError:
+            gone.add(directory)
+    candidates = []
+    stale = 0
+    for entries in listings.values():
+        for entry in entries:
+            if entry.is_dir():
+                if entry.path not in dirs:
+                    new = list(walk_files(entry.path))
+                    candidates.extend(new)
+                    stale += len(new)
+                continue
+            if not entry.is_file():
+                continue
+            indexed = files.get(entry.path)
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            if indexed is None or indexed[:2] != (st.st_mtime_ns, st.st_size):
+                candidates.append(entry.path)
+                stale += 1
+            elif ids is None or indexed[2] in ids:
+                candidates.append(entry.path)
+    for file, (_, _, file_id) in files.items():
+        directory = os.path.dirname(file)
+        if (
+            file.startswith(prefix)
+            and (ids is None or file_id in ids)
+            and directory not in gone
+            and directory not in listings
+        ):
+            candidates.append(file)
+    return candidates, stale
+
+
+def find_candidates(
+    path: str, literals: list[str] | None, rescan: bool = False
+) -> list[str]:
+    """
+    Возвращает файлы директории, которые могут содержать паттерн.
+
+    Файл-кандидат должен содержать все триграммы хотя бы одной из
+    подстрок literals. Если подстроки неизвестны (regex) или короче трёх
+    байт, кандидатами считаются все файлы. Свежесть индекса проверяется
+    по mtime директорий (changed_dir_files): новые, удалённые и
+    заменённые файлы находятся без stat каждого файла. С rescan (и для
+    индекса, построенного без mtime директорий) проверяется каждый файл
+    (rescan_files), что находит и изменения на месте, но стоит
+    O(числа файлов). Новые и изменённые файлы считаются кандидатами, и в
+    stderr выводится предупреждение об устаревшем индексе.
+
+    Args:
+        path: Абсолютный путь к директории.
+        literals: Подстроки, одна из которых обязана быть в совпадении.
+        rescan: Проверять mtime и размер каждого файла.
+
+    Returns:
+        Отсортированный список путей к файлам-кандидатам.
+
+    Prints:
+        Предупреждение в stderr, если индекс устарел.
+
+    Raises:
+        IndexNotFound: Если для директории не построен индекс.
+    """
+    data = find_index(path)
+    if data is None:
+        raise IndexNotFound(
+            f'Индекс для {path} не найден, выполните index build {path}'
+        )
+    postings: dict[bytes, array] = data['postings']
+    needles = [
+        literal.encode('utf-8', 'surrogateescape').lower()
+        for literal in literals or []
+    ]
+    ids: set[int] | None = None
+    if needles and min(map(len, needles)) >= 3:
+        ids = set()
+        for needle in needles:
+            ids.update(match_ids(postings, needle))
+    if rescan or 'dirs' not in data:
+        candidates, stale = rescan_files(path, data['files'], ids)
+    else:
+        candidates, stale = changed_dir_files(path, data, ids)
+    if stale:
+        print(
+            f'Индекс {data["root"]} устарел (изменено или не проиндексировано '
+            f'файлов: {stale}), выполните index build {data["root"]}',
+            file=sys.stderr,
+        )
+    return sorted(candidates)
+
+
+def index(flags: set, paths: list[str]) -> None:
+    """
+    Управляет триграммным индексом для grep --indexed.
+
+    Поддерживаемые действия:
+        - build [dir]*: построить или обновить индекс директорий
+          (по умолчанию текущей).
+
+    Args:
+        flags: Флаг утилиты. Должен быть пустым.
+        paths: Действие и пути к директориям.
+
+    Prints:
+        Число файлов в индексе и число переиндексированных файлов.
+
+    Raises:
+        IncorrectFlag: Если указаны флаги.
+        IncorrectInput: Если действие не указано или неизвестно.
+        PathError: Если указанный путь не существует.
+        IsNotDirectory: Если путь не является директорией.
+    """
+    if flags:
+        raise IncorrectFlag('Для index не поддерживаются флаги')
+    if not paths or paths[0] != 'build':
+        raise IncorrectInput('Использование: index build [dir]*')
+    for path in paths[1:] or [os.getcwd()]:
+        path = os.path.abspath(normalize_path(path))
+        is_correct_directory(path)
+        total, updated = build_index(path)
+        print(f'{path}: файлов в индексе {total}, обновлено {updated}')
@@ -1,61 +1,328 @@
+import heapq
 import os
 import stat
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 from datetime import datetime
 
 import src.config.logger
+from src.config.consts import LISTING_CACHE_MIN_AGE, LISTING_CACHE_SIZE
+from src.config.exceptions import IncorrectFlag
 from src.config.functions import (
+    get_int_flag,
     is_correct_directory,
     is_correct_flag,
     normalize_path,
 )
+from src.config.output import Output
 
 
-def output(flags: set, path: str) -> None:
+class Entry:
     """
-    Выводит имена файлов в директории.
+    Запись директории для вывода ls.
+
+    Повторяет нужную ls часть интерфейса Entry, но может быть
+    создана из кэша листинга. Результат stat хранится в объекте, поэтому
+    за один вызов ls на запись приходится не больше одного системного
+    вызова. Для битой символической ссылки stat возвращает stat ссылки.
+
+    Attributes:
+        name: Имя записи.
+        path: Полный путь к записи.
+        directory: True, если запись - директория (без перехода по ссылке).
+    """
+
+    __slots__ = ('name', 'path', 'directory', 'cached_stat')
+
+    def __init__(self, name: str, path: str, directory: bool) -> None:
+        self.name = name
+        self.path = path
+        self.directory = directory
+        self.cached_stat: os.stat_result | None = None
+
+    def is_dir(self) -> bool:
+        """
+        Проверяет, является ли запись директорией (не ссылкой на неё).
+        """
+        return self.directory
+
+    def stat(self) -> os.stat_result:
+        """
+        Возвращает stat записи, запрашивая его только при первом вызове.
+        """
+        if self.cached_stat is None:
+            try:
+                self.cached_stat = os.stat(self.path)
+            except FileNotFoundError:
+                self.cached_stat = os.lstat(self.path)
+        return self.cached_stat
+
+
+class ListingCache:
+    """
+    LRU-кэш листингов директорий.
+
+    Для каждой директории хранятся имена записей и признак директории
+    (из d_type, без stat). Листинг действителен, пока у директории
+    совпадают устройство, inode и st_mtime_ns: создание, удаление и
+    переименование записей меняют mtime директории. Размеры и время
+    изменения файлов не кэшируются, потому что на mtime директории они
+    не влияют, и ls -l запрашивает их заново.
+
+    Директории, изменённые меньше min_age наносекунд назад, не
+    кэшируются: следующее изменение в тот же тик часов файловой системы
+    не изменило бы mtime. Старые листинги вытесняются, когда суммарное
+    число записей в кэше превышает size.
+
+    Attributes:
+        size: Максимальное суммарное число записей в кэше.
+        min_age: Минимальный возраст mtime директории для кэширования (нс).
+        listings: Листинги по путям в порядке последнего использования.
+        count: Текущее суммарное число записей.
+    """
+
+    def __init__(
+        self,
+        size: int = LISTING_CACHE_SIZE,
+        min_age: int = LISTING_CACHE_MIN_AGE,
+    ) -> None:
+        self.size = size
+        self.min_age = min_age
+        self.listings: OrderedDict[
+            str, tuple[tuple[int, int, int], list[tuple[str, bool]]]
+        ] = OrderedDict()
+        self.count = 0
+
+    def get(self, path: str) -> list[tuple[str, bool]]:
+        """
+        Возвращает листинг директории из кэша или читает его заново.
+
+        Args:
+            path: Путь к директории.
+
+        Returns:
+            Список пар (имя, является ли директорией).
+        """
+        st = os.stat(path)
+        key = (st.st_dev, st.st_ino, st.st_mtime_ns)
+        cached = self.listings.get(path)
+        if cached is not None and cached[0] == key:
+            self.listings.move_to_end(path)
+            return cached[1]
+        with os.scandir(path) as it:
+            names = [(e.name, e.is_dir(follow_symlinks=False)) for e in it]
+        self.discard(path)
+        if (
+            len(names) <= self.size
+            and time.time_ns() - st.st_mtime_ns >= self.min_age
+        ):
+            self.listings[path] = (key, names)
+            self.count += len(names)
+            while self.count > self.size:
+                _, (_, evicted) = self.listings.popitem(last=False)
+                self.count -= len(evicted)
+        return names
+
+    def discard(self, path: str) -> None:
+        """
+        Удаляет листинг директории из кэша.
+
+        Args:
+            path: Путь к директории.
+        """
+        cached = self.listings.pop(path, None)
+        if cached is not None:
+            self.count -= len(cached[1])
+
+
+listing_cache = ListingCache()
+
+
+def scan_dir(flags: set, path: str) -> tuple[bool, list[Entry]]:
+    """
+    Читает директорию через кэш листингов.
 
     Args:
+        flags: Флаги ls ('a'/'all' - показывать скрытые файлы).
         path: Путь к директории.
 
+    Returns:
+        Кортеж (есть ли в директории записи, записи для вывода).
+    """
+    show_hidden = 'a' in flags or 'all' in flags
+    names = listing_cache.get(path)
+    prefix = os.path.join(path, '')
+    visible = [
+        Entry(name, prefix + name, directory)
+        for name, directory in names
+        if show_hidden or not name.startswith('.')
+    ]
+    return bool(names), visible
+
+
+def sort_key(flags: set) -> Callable[[Entry], tuple]:
+    """
+    Возвращает ключ сортировки записей по флагам ls.
+
+    По размеру и времени изменения записи идут от больших к меньшим,
+    при равенстве - по имени. Размер и время берутся из stat,
+    сохранённого в Entry, поэтому detailed_output повторно их не запрашивает.
+
+    Args:
+        flags: Флаги ls ('S'/'size' - по размеру, 't'/'time' - по времени).
+
+    Returns:
+        Функция-ключ для сортировки по возрастанию.
+    """
+    if 'S' in flags or 'size' in flags:
+        return lambda e: (-e.stat().st_size, e.name)
+    if 't' in flags or 'time' in flags:
+        return lambda e: (-e.stat().st_mtime_ns, e.name)
+    return lambda e: (e.name,)
+
+
+def get_top(flags: set) -> int | None:
+    """
+    Возвращает число записей для вывода из флага --top=N.
+
+    Args:
+        flags: Флаги ls.
+
+    Returns:
+        Число записей или None, если ограничения нет.
+
+    Raises:
+        IncorrectFlag: Если значение 'top' не указано или неверно.
+    """
+    if 'top' in flags:
+        raise IncorrectFlag('Не указано число записей: --top=N')
+    return get_int_flag(flags, {'top'}, 0) or None
+
+
+def order_entries(flags: set, entries: list[Entry]) -> list[Entry]:
+    """
+    Упорядочивает записи директории для вывода.
+
+    При --top=N полная сортировка не выполняется: первые N записей
+    выбираются частичной сортировкой через кучу (heapq), за
+    O(n log N) вместо O(n log n).
+
+    Args:
+        flags: Флаги ls ('S', 't', 'r'/'reverse', 'top=N').
+        entries: Записи директории.
+
+    Returns:
+        Упорядоченные записи.
+    """
+    key = sort_key(flags)
+    reverse = 'r' in flags or 'reverse' in flags
+    top = get_top(flags)
+    if top is None:
+        return sorted(entries, key=key, reverse=reverse)
+    if reverse:
+        return heapq.nlargest(top, entries, key=key)
+    return heapq.nsmallest(top, entries, key=key)
+
+
+def output(has_entries: bool, entries: list[Entry], out: Output) -> None:
+    """
+    Выводит имена файлов в директории.
+
+    Args:
+        has_entries: Есть ли в директории записи (в том числе скрытые).
+        entries: Упорядоченные записи для вывода.
+        out: Буферизованный вывод.
+
     Prints:
         Печатает имена файлов.
     """
-    pointer = False
-    if 'a' in flags or 'all' in flags:
-        pointer = True
-    if os.listdir(path):
-        for file in os.listdir(path):
-            if (not file.startswith('.')) or (
-                file.startswith('.') and pointer
-            ):
-                print(file, end=' ')
-        print()
+    if has_entries:
+        out.write(''.join(f'{entry.name} ' for entry in entries) + '\n')
 
 
-def detailed_output(flags: set, path: str) -> None:
+def detailed_output(entries: list[Entry], out: Output) -> None:
     """
     Выводит подробную информацию о файлах в директории.
 
     Формат вывода: Имя Размер Время_изменения Права_доступа.
+    Время форматируется один раз на каждую встреченную минуту.
 
     Args:
-        path: Путь к директории.
+        entries: Упорядоченные записи для вывода.
+        out: Буферизованный вывод.
 
     Prints:
         Печатает подробную информацию о файлах.
     """
-    pointer = False
-    if 'a' in flags or 'all' in flags:
-        pointer = True
-    for file in sorted(os.listdir(path)):
-        if (not file.startswith('.')) or (file.startswith('.') and pointer):
-            file_path = os.path.join(path, file)
-            file_stat = os.stat(file_path)
-            modes = stat.filemode(file_stat.st_mode)
-            size = file_stat.st_size
-            time_mode = datetime.fromtimestamp(int(file_stat.st_mtime))
-            time_mode_f = time_mode.strftime('%b %d %H:%M')
-            print(f'{file:15} {size:7} {time_mode_f:12} {modes:10}')
+    times: dict[int, str] = {}
+    for entry in entries:
+        file_stat = entry.stat()
+        modes = stat.filemode(file_stat.st_mode)
+        size = file_stat.st_size
+        minute = int(file_stat.st_mtime) // 60
+        if minute not in times:
+            time_mode = datetime.fromtimestamp(minute * 60)
+            times[minute] = time_mode.strftime('%b %d %H:%M')
+        time_mode_f = times[minute]
+        out.write(f'{entry.name:15} {size:7} {time_mode_f:12} {modes:10}\n')
+
+
+def list_dir(flags: set, path: str, out: Output) -> list[Entry]:
+    """
+    Выводит содержимое одной директории.
+
+    Args:
+        flags: Флаги ls.
+        path: Путь к директории.
+        out: Буферизованный вывод.
+
+    Returns:
+        Все записи директории, доступные для вывода (без учёта --top).
+    """
+    has_entries, entries = scan_dir(flags, path)
+    shown = order_entries(flags, entries)
+    if 'l' in flags:
+        detailed_output(shown, out)
+    else:
+        output(has_entries, shown, out)
+    return entries
+
+
+def list_tree(flags: set, path: str, out: Output) -> None:
+    """
+    Рекурсивно выводит содержимое директории (ls -R).
+
+    Директории обходятся в глубину через стек и выводятся по мере
+    чтения, сортировка идёт только внутри каждой директории, а
+    поддиректории обходятся в порядке имён. В памяти хранятся записи
+    текущей директории и пути ещё не выведенных поддиректорий. По
+    символическим ссылкам на директории обход не идёт.
+
+    Args:
+        flags: Флаги ls.
+        path: Путь к корневой директории.
+        out: Буферизованный вывод.
+
+    Prints:
+        Для каждой директории - заголовок `путь:` и её содержимое.
+    """
+    stack = [path]
+    while stack:
+        path = stack.pop()
+        out.write(f'{path}:\n')
+        try:
+            entries = list_dir(flags, path, out)
+        except PermissionError:
+            out.write(f'Нет прав на чтение {path}\n')
+            src.config.logger.main_logger.error(f'Нет прав на чтение {path}')
+            continue
+        stack.extend(
+            sorted(
+                (entry.path for entry in entries if entry.is_dir()),
+                reverse=True,
+            )
+        )
 
 
 def ls(flags: set, paths: list[str]) -> None:
@@ -66,6 +333,11 @@ def ls(flags: set, paths: list[str]) -> None:
         flags: множество флагов:
             - 'l': подробный вывод.
             - 'a'/'all': вывод скрытых файлов.
+            - 'R'/'recursive': рекурсивный вывод поддиректорий.
+            - 'S'/'size': сортировка по размеру (сначала большие).
+            - 't'/'time': сортировка по времени изменения (сначала новые).
+            - 'r'/'reverse': обратный порядок сортировки.
+            - 'top=N': вывести только первые N записей.
         paths: Список путей к директориям. Если пустой, то используется текущая
 
     Prints:
@@ -76,19 +348,39 @@ def ls(flags: set, paths: list[str]) -> None:
         IsNotDirectory: Если путь не является директорией.
         PathError: Если указана несуществующая директория.
     """
-    is_correct_flag(flags, {'l', 'a', 'all'})
+    is_correct_flag(
+        flags,
+        {
+            'l',
+            'a',
+            'all',
+            'R',
+            'recursive',
+            'S',
+            'size',
+            't',
+            'time',
+            'r',
+            'reverse',
+            'top',
+        },
+    )
     paths = paths if paths else [os.getcwd()]
     pointer = True if len(paths) > 1 else False
-    for path in paths:
-        path = normalize_path(path)
-        is_correct_directory(path)
-        try:
-            if pointer:
-                print(f'{path.split(os.sep)[-1]}: ')
-            if 'l' in flags:
-                detailed_output(flags, path)
-            else:
-                output(flags, path)
-        except PermissionError:
-            print(f'Нет прав на чтение {path}')
-            src.config.logger.main_logger.error(f'Нет прав на чтение {path}')
+    recursive = 'R' in flags or 'recursive' in flags
+    with Output() as out:
+        for path in paths:
+            path = normalize_path(path)
+            is_correct_directory(path)
+            if recursive:
+                list_tree(flags, path, out)
+                continue
+            try:
+                if pointer:
+                    out.write(f'{path.split(os.sep)[-1]}: \n')
+                list_dir(flags, path, out)
+            except PermissionError:
+                out.write(f'Нет прав на чтение {path}\n')
+                src.config.logger.main_logger.error(
+                    f'Нет прав на чтение {path}'
+                )
@@ -1,10 +1,54 @@
 import os
 import shutil
+import stat
 
 from src.config.consts import FOR_UNDO_HISTORY
-from src.config.exceptions import AlreadyExists, IncorrectFlag, IncorrectInput
-from src.config.functions import normalize_path, resolve_file_path
+from src.config.copy_engine import copy_file
+from src.config.exceptions import AlreadyExists, IncorrectInput
+from src.config.functions import (
+    is_correct_flag,
+    normalize_path,
+    resolve_file_path,
+    scan_tree,
+)
 from src.config.logger import main_logger
+from src.config.progress import Progress
+
+
+def add_move_total(progress: Progress, src: str, dst: str) -> None:
+    """
+    Добавляет в прогресс объём данных, которые придётся копировать.
+
+    Внутри одной файловой системы shutil.move просто переименовывает
+    путь, и копировать нечего. Между файловыми системами файлы
+    копируются и удаляются, поэтому учитывается суммарный размер
+    обычных файлов. Символические ссылки копируются как ссылки, поэтому
+    размеры берутся через lstat, а сами ссылки не считаются.
+
+    Args:
+        progress: Прогресс перемещения.
+        src: Абсолютный путь к перемещаемому файлу или директории.
+        dst: Путь назначения.
+    """
+    if not progress.enabled:
+        return
+    parent = os.path.dirname(os.path.abspath(dst))
+    if os.lstat(src).st_dev == os.stat(parent).st_dev:
+        return
+    sizes = []
+    st = os.lstat(src)
+    if stat.S_ISDIR(st.st_mode):
+        for _, entries in scan_tree(src):
+            for entry in entries:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                try:
+                    sizes.append(entry.stat(follow_symlinks=False).st_size)
+                except OSError:
+                    continue
+    elif stat.S_ISREG(st.st_mode):
+        sizes.append(st.st_size)
+    progress.add_total(sum(sizes), len(sizes))
 
 
 def mv(flags: set, paths: list[str]) -> None:
@@ -12,7 +56,10 @@ def mv(flags: set, paths: list[str]) -> None:
     Перемещает или переименовывает файлы и директории.
 
     Args:
-        flags: Флаг утилиты. Должен быть пустым.
+        flags: Множество флагов команды:
+            - 'no-progress': не выводить строку прогресса при
+              перемещении между файловыми системами (она выводится в
+              stderr, только если это терминал).
         paths: Список из минимум 2 элементов:
             - paths[:-1]: файлы/директории для перемещения.
             - paths[-1]: директория назначения или новое имя.
@@ -20,31 +67,41 @@ def mv(flags: set, paths: list[str]) -> None:
     Returns:
         None.
 
+    Prints:
+        В терминал (stderr) - прогресс копирования между файловыми
+        системами.
+
     Raises:
-        IncorrectFlag: Если указан флаг.
+        IncorrectFlag: Если указан неверный флаг.
         IncorrectInput: Если указано меньше 2 путей.
         PathError: Если исходный путь не существует.
         AlreadyExists: Если целевой файл уже существует.
     """
-    if flags:
-        raise IncorrectFlag('Для mv не поддерживаются флаги')
+    is_correct_flag(flags, {'no-progress'})
     if len(paths) < 2:
         raise IncorrectInput('Неверное количество аргументов для mv')
     moved: list = []
     dest_path = paths[-1]
-    for file in paths[:-1]:
-        try:
-            file_name = file.split(os.sep)[-1]
-            resolved_path = resolve_file_path(file_name, dest_path)
-            file = normalize_path(file)
-            shutil.move(file, resolved_path)
-            moved.append((file, resolved_path))
-        except PermissionError:
-            print('Ошибка: Недостаточно прав')
-            main_logger.error(f'{file_name} пропущен: Недостаточно прав')
-
-        except AlreadyExists as message:
-            print(f'{file_name} пропущен: {message}')
-            main_logger.error(f'{file_name} пропущен: {message}')
+    with Progress(flags) as progress:
+
+        def copy_function(src: str, dst: str) -> None:
+            copy_file(src, dst, metadata=True, progress=progress.callback)
+            progress.file_done()
+
+        for file in paths[:-1]:
+            try:
+                file_name = file.split(os.sep)[-1]
+                resolved_path = resolve_file_path(file_name, dest_path)
+                file = normalize_path(file)
+                add_move_total(progress, file, resolved_path)
+                shutil.move(file, resolved_path, copy_function=copy_function)
+                moved.append((file, resolved_path))
+            except PermissionError:
+                print('Ошибка: Недостаточно прав')
+                main_logger.error(f'{file_name} пропущен: Недостаточно прав')
+
+            except AlreadyExists as message:
+                print(f'{file_name} пропущен: {message}')
+                main_logger.error(f'{file_name} пропущен: {message}')
     if moved:
         FOR_UNDO_HISTORY.append(['mv', flags, moved])
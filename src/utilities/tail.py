@@ -0,0 +1,130 @@
+import os
+import sys
+import time
+from typing import BinaryIO
+
+from src.config.consts import CHUNK_SIZE, TAIL_FOLLOW_INTERVAL
+from src.config.exceptions import IncorrectInput
+from src.config.functions import (
+    is_correct_file,
+    is_correct_flag,
+    normalize_path,
+)
+from src.utilities.cat import end_line, write_range
+from src.utilities.head import get_lines
+
+
+def find_tail_start(f: BinaryIO, count: int) -> int:
+    """
+    Находит начало последних count строк файла.
+
+    Файл читается с конца назад блоками по CHUNK_SIZE байт, переводы
+    строк считаются bytes.count, поэтому время работы зависит от длины
+    нужных строк, а не от размера файла. Завершающий перевод строки
+    новую строку не начинает.
+
+    Args:
+        f: Файл, открытый в бинарном режиме.
+        count: Число строк.
+
+    Returns:
+        Смещение начала последних count строк (0, если строк меньше).
+    """
+    size = os.fstat(f.fileno()).st_size
+    if not count:
+        return size
+    pos = size
+    if size:
+        f.seek(size - 1)
+        if f.read(1) == b'\n':
+            pos -= 1
+    while pos > 0:
+        block = min(CHUNK_SIZE, pos)
+        pos -= block
+        f.seek(pos)
+        chunk = f.read(block)
+        found = chunk.count(b'\n')
+        if found >= count:
+            index = len(chunk)
+            for _ in range(count):
+                index = chunk.rindex(b'\n', 0, index)
+            return pos + index + 1
+        count -= found
+    return 0
+
+
+def follow(f: BinaryIO, pos: int, last: bytes) -> bytes:
+    """
+    Выводит данные, дописываемые в файл, до нажатия Ctrl+C (tail -f).
+
+    Раз в TAIL_FOLLOW_INTERVAL секунд сравнивает размер файла с уже
+    выведенным и выводит только новый диапазон. Если файл усечён,
+    вывод продолжается с его начала.
+
+    Args:
+        f: Файл, открытый в бинарном режиме.
+        pos: Смещение, до которого файл уже выведен.
+        last: Последний уже выведенный байт.
+
+    Returns:
+        Последний выведенный байт.
+
+    Prints:
+        Новые данные файла.
+    """
+    try:
+        while True:
+            time.sleep(TAIL_FOLLOW_INTERVAL)
+            size = os.fstat(f.fileno()).st_size
+            if size < pos:
+                pos = 0
+            if size > pos:
+                last = write_range(f, pos, size)
+                sys.stdout.flush()
+                pos = size
+    except KeyboardInterrupt:
+        pass
+    return last
+
+
+def tail(flags: set, paths: list[str]) -> None:
+    """
+    Выводит последние строки файлов.
+
+    Args:
+        flags: множество флагов:
+            - 'n=N'/'lines=N': число строк (по умолчанию 10).
+            - 'f'/'follow': после вывода ждать и выводить новые строки
+              до нажатия Ctrl+C (только для одного файла).
+        paths: Список путей. Должен содержать хотя бы один файл.
+
+    Prints:
+        Последние строки файлов; для нескольких файлов перед каждым
+        выводится заголовок '==> путь <=='.
+
+    Raises:
+        IncorrectFlag: Если указан неверный флаг или число строк.
+        IncorrectInput: Если список paths пуст или для -f указано
+            несколько файлов.
+        PathError: Если указанный путь не существует.
+        IsNotFile: Если путь указывает на директорию.
+    """
+    is_correct_flag(flags, {'n', 'lines', 'f', 'follow'})
+    count = get_lines(flags)
+    if not paths:
+        raise IncorrectInput('Не указан файл для чтения')
+    follow_mode = 'f' in flags or 'follow' in flags
+    if follow_mode and len(paths) > 1:
+        raise IncorrectInput('tail -f следит только за одним файлом')
+    for file in paths:
+        path = normalize_path(file)
+        is_correct_file(path)
+        if len(paths) > 1:
+            print(f'==> {file} <==')
+        with open(path, 'rb', buffering=CHUNK_SIZE) as f:
+            size = os.fstat(f.fileno()).st_size
+            last = write_range(f, find_tail_start(f, count), size)
+            if follow_mode:
+                sys.stdout.flush()
+                last = follow(f, size, last)
+        end_line(last)
@@ -0,0 +1,122 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config.consts import WC_CHUNK_SIZE
+from src.config.exceptions import IncorrectInput
+from src.config.functions import (
+    is_correct_file,
+    is_correct_flag,
+    normalize_path,
+)
+
+WHITESPACE = b' \t\n\r\x0b\x0c'
+COUNTERS = ({'l', 'lines'}, {'w', 'words'}, {'c', 'bytes'})
+
+
+def count_file(path: str, words: bool) -> tuple[int, int, int]:
+    """
+    Считает строки, слова и байты файла.
+
+    Файл читается блоками по WC_CHUNK_SIZE байт, строки считаются
+    bytes.count(b'\\n'), слова - bytes.split() по всему блоку, без
+    цикла по строкам. Слово, разрезанное границей блока, учитывается
+    один раз.
+
+    Args:
+        path: Путь к файлу.
+        words: Считать ли слова (без них файл только сканируется на
+            переводы строк).
+
+    Returns:
+        Кортеж (строки, слова, байты).
+    """
+    lines = count = size = 0
+    in_word = False
+    with open(path, 'rb', buffering=0) as f:
+        while chunk := f.read(WC_CHUNK_SIZE):
+            size += len(chunk)
+            lines += chunk.count(b'\n')
+            if words:
+                count += len(chunk.split())
+                if in_word and chunk[0] not in WHITESPACE:
+                    count -= 1
+                in_word = chunk[-1] not in WHITESPACE
+    return lines, count, size
+
+
+def file_stats(path: str, flags: set) -> tuple[int, int, int]:
+    """
+    Возвращает счётчики файла, читая его только при необходимости.
+
+    Если нужен только размер (-c), файл не читается: размер берётся
+    из stat.
+
+    Args:
+        path: Путь к файлу.
+        flags: Флаги wc.
+
+    Returns:
+        Кортеж (строки, слова, байты).
+    """
+    if not {'l', 'lines', 'w', 'words'} & flags:
+        return 0, 0, os.stat(path).st_size
+    return count_file(path, 'w' in flags or 'words' in flags)
+
+
+def format_stats(columns: list[int], stats: tuple[int, ...], name: str) -> str:
+    """
+    Форматирует строку вывода wc.
+
+    Args:
+        columns: Индексы выводимых счётчиков (0 - строки, 1 - слова,
+            2 - байты).
+        stats: Счётчики.
+        name: Имя файла.
+
+    Returns:
+        Строка со счётчиками, выровненными по правому краю, и именем.
+    """
+    return ' '.join(f'{stats[i]:>7}' for i in columns) + f' {name}'
+
+
+def wc(flags: set, paths: list[str]) -> None:
+    """
+    Выводит число строк, слов и байт в файлах.
+
+    Файлы обрабатываются одновременно в пуле потоков: чтение файлов
+    перекрывается, а результаты выводятся в порядке аргументов.
+
+    Args:
+        flags: множество флагов (без флагов выводятся все счётчики):
+            - 'l'/'lines': число строк.
+            - 'w'/'words': число слов.
+            - 'c'/'bytes': число байт.
+        paths: Список путей. Должен содержать хотя бы один файл.
+
+    Prints:
+        Строку со счётчиками для каждого файла и итоговую строку, если
+        файлов несколько.
+
+    Raises:
+        IncorrectFlag: Если указан неверный флаг.
+        IncorrectInput: Если список paths пуст.
+        PathError: Если указанный путь не существует.
+        IsNotFile: Если путь указывает на директорию.
+    """
+    is_correct_flag(flags, {'l', 'lines', 'w', 'words', 'c', 'bytes'})
+    if not paths:
+        raise IncorrectInput('Не указан файл для подсчёта')
+    if not flags:
+        flags = {'l', 'w', 'c'}
+    columns = [i for i, names in enumerate(COUNTERS) if names & flags]
+    files = [normalize_path(path) for path in paths]
+    for path in files:
+        is_correct_file(path)
+    workers = min(len(files), os.cpu_count() or 1)
+    with ThreadPoolExecutor(workers) as pool:
+        results = list(pool.map(lambda p: file_stats(p, flags), files))
+    for name, stats in zip(paths, results, strict=True):
+        print(format_stats(columns, stats, name))
+    if len(results) > 1:
+        total = tuple(sum(column) for column in zip(*results, strict=True))
+        print(format_stats(columns, total, 'итого'))
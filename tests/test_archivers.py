@@ -1,6 +1,9 @@
 import os
 import shutil
+import socket
+import tarfile
 import tempfile
+import zipfile
 from pathlib import Path
 
 import pytest
@@ -86,6 +89,51 @@ class TestMakeArchive:
         with pytest.raises(src.config.exceptions.IncorrectFlag):
             make_archive('zip', {'r'}, ['source_dir', 'output'])
 
+    def test_make_archive_no_progress_flag(self):
+        make_archive('zip', {'no-progress'}, ['source_dir', 'output'])
+        assert Path(self.test_dir, 'output.zip').exists()
+
+    def test_make_zip_contents(self):
+        Path(self.source_dir, 'sub').mkdir()
+        Path(self.source_dir, 'sub', 'file3.txt').write_text('Content 3')
+        make_archive('zip', set(), ['source_dir', 'output'])
+
+        with zipfile.ZipFile(Path(self.test_dir, 'output.zip')) as archive:
+            assert sorted(archive.namelist()) == [
+                'file1.txt', 'file2.txt', 'sub/', 'sub/file3.txt'
+            ]
+            assert archive.read('sub/file3.txt') == b'Content 3'
+
+    def test_make_tar_contents(self):
+        Path(self.source_dir, 'sub').mkdir()
+        Path(self.source_dir, 'sub', 'file3.txt').write_text('Content 3')
+        make_archive('tar', set(), ['source_dir', 'output'])
+
+        with tarfile.open(Path(self.test_dir, 'output.tar.gz')) as archive:
+            names = archive.getnames()
+            member = archive.extractfile('./sub/file3.txt')
+            assert member is not None and member.read() == b'Content 3'
+        assert './file1.txt' in names and './sub' in names
+
+    def test_make_tar_skips_socket(self):
+        sock = socket.socket(socket.AF_UNIX)
+        try:
+            sock.bind(str(Path(self.source_dir, 'sock')))
+            make_archive('tar', set(), ['source_dir', 'output'])
+        finally:
+            sock.close()
+
+        with tarfile.open(Path(self.test_dir, 'output.tar.gz')) as archive:
+            names = archive.getnames()
+        assert './file1.txt' in names and './sock' not in names
+
+    def test_make_archive_skips_itself(self):
+        make_archive('zip', set(), ['source_dir', 'source_dir/output'])
+
+        path = Path(self.source_dir, 'output.zip')
+        with zipfile.ZipFile(path) as archive:
+            assert 'output.zip' not in archive.namelist()
+
     def test_make_archive_too_many_paths(self):
         with pytest.raises(src.config.exceptions.IncorrectInput):
             make_archive('zip', set(), ['dir1', 'dir2', 'dir3'])
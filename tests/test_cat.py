@@ -6,6 +6,7 @@ from pathlib import Path
 import pytest
 
 import src.config.exceptions
+import src.utilities.cat
 from src.utilities.cat import cat
 
 
@@ -101,3 +102,104 @@ class TestCatCommand:
             cat(set(), ['file1.txt', 'subdir'])
 
             assert 'Hello World!' in captured.out
+
+    def test_cat_non_utf8_file(self, capsys):
+        Path(self.test_dir, 'latin.txt').write_bytes(b'caf\xe9\n')
+
+        cat(set(), ['latin.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == 'caf\ufffd\n'
+
+    def test_cat_char_split_between_chunks(self, capsys, monkeypatch):
+        monkeypatch.setattr(src.utilities.cat, 'CHUNK_SIZE', 3)
+        Path(self.test_dir, 'ru.txt').write_text('аб\n', encoding='utf-8')
+
+        cat(set(), ['ru.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == 'аб\n'
+
+    def test_cat_adds_missing_newline(self, capsys):
+        cat(set(), ['file1.txt', 'file2.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == 'Hello World!\nLine 1\nLine 2\nLine 3\n'
+
+    def redirect_stdout(self, monkeypatch):
+        out = open(os.path.join(self.test_dir, 'out.bin'), 'w')
+        monkeypatch.setattr('sys.stdout', out)
+        return out
+
+    def test_cat_to_file_copies_bytes(self, monkeypatch):
+        data = bytes(range(256)) * 1000
+        Path(self.test_dir, 'blob.bin').write_bytes(data + b'\n')
+        out = self.redirect_stdout(monkeypatch)
+
+        cat(set(), ['blob.bin', 'file1.txt'])
+        out.close()
+
+        result = Path(self.test_dir, 'out.bin').read_bytes()
+        assert result == data + b'\nHello World!\n'
+
+    def test_cat_to_file_without_sendfile(self, monkeypatch):
+        def no_sendfile(*args):
+            raise OSError('sendfile')
+
+        monkeypatch.setattr(os, 'sendfile', no_sendfile)
+        monkeypatch.setattr(src.utilities.cat, 'CHUNK_SIZE', 4)
+        out = self.redirect_stdout(monkeypatch)
+
+        cat(set(), ['file2.txt'])
+        out.close()
+
+        result = Path(self.test_dir, 'out.bin').read_bytes()
+        assert result == b'Line 1\nLine 2\nLine 3\n'
+
+    def test_send_file_empty_range(self):
+        with open('file1.txt', 'rb') as f:
+            assert src.utilities.cat.send_file(f, 1, 5, 5) == b''
+
+    def test_cat_empty_file_to_file(self, monkeypatch):
+        out = self.redirect_stdout(monkeypatch)
+
+        cat(set(), ['empty.txt', 'file1.txt'])
+        out.close()
+
+        result = Path(self.test_dir, 'out.bin').read_bytes()
+        assert result == b'Hello World!\n'
+
+    def test_cat_bytes_range(self, capsys):
+        cat({'bytes=6:11'}, ['file1.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == 'World\n'
+
+    def test_cat_bytes_open_range(self, capsys):
+        cat({'bytes=6:'}, ['file1.txt'])
+        cat({'bytes=:5'}, ['file1.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == 'World!\nHello\n'
+
+    def test_cat_bytes_past_end(self, capsys):
+        cat({'bytes=100:200'}, ['file1.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == ''
+
+    def test_cat_bytes_to_file(self, monkeypatch):
+        out = self.redirect_stdout(monkeypatch)
+
+        cat({'bytes=7:13'}, ['file2.txt'])
+        out.close()
+
+        assert Path(self.test_dir, 'out.bin').read_bytes() == b'Line 2\n'
+
+    def test_cat_bytes_without_value(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            cat({'bytes'}, ['file1.txt'])
+
+    def test_cat_bytes_incorrect_range(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            cat({'bytes=a:b'}, ['file1.txt'])
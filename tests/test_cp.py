@@ -1,12 +1,18 @@
+import hashlib
 import os
 import shutil
+import sys
 import tempfile
 from pathlib import Path
 
 import pytest
 
+import src.config.consts
+import src.config.copy_engine
 import src.config.exceptions
+from src.config.copy_engine import copy_file, copy_tree
 from src.utilities.cp import cp
+from src.utilities.undo import undo
 
 
 class TestCpCommand:
@@ -143,3 +149,496 @@ class TestCpCommand:
     def test_cp_incorrect_flags(self):
         with pytest.raises(src.config.exceptions.IncorrectFlag):
             cp({'r', 'a'}, ['file1.txt', 'copy.txt'])
+
+    def test_cp_reports_progress(self, monkeypatch, terminal):
+        monkeypatch.setattr(sys, 'stderr', terminal)
+        cp({'r'}, ['dir1', 'copy_dir'])
+
+        assert 'файлов 1/1' in terminal.getvalue()
+        assert terminal.getvalue().endswith('\n')
+
+    def test_cp_dangling_symlink_with_progress(self, monkeypatch, terminal):
+        monkeypatch.setattr(sys, 'stderr', terminal)
+        Path(self.test_dir, 'dir1', 'dangling').symlink_to('missing')
+
+        with pytest.raises(shutil.Error) as error:
+            cp({'r'}, ['dir1', 'copy_dir'])
+
+        assert 'dangling' in str(error.value)
+        assert Path(self.test_dir, 'copy_dir', 'nested.txt').exists()
+
+    def test_cp_no_progress(self, monkeypatch, terminal):
+        monkeypatch.setattr(sys, 'stderr', terminal)
+        cp({'no-progress'}, ['file1.txt', 'copy.txt'])
+
+        assert terminal.getvalue() == ''
+        assert Path(self.test_dir, 'copy.txt').read_text() == 'Content 1'
+
+    def test_cp_keeps_mode(self):
+        os.chmod('file1.txt', 0o640)
+
+        cp(set(), ['file1.txt', 'copy.txt'])
+
+        assert os.stat('copy.txt').st_mode & 0o777 == 0o640
+
+    def test_cp_verbose_reports_method(self, capsys):
+        cp({'v'}, ['file1.txt', 'copy.txt'])
+        captured = capsys.readouterr()
+
+        assert 'copy.txt' in captured.out
+        assert any(
+            method in captured.out
+            for method in ('copy_file_range', 'sendfile', 'readinto')
+        )
+
+    def test_cp_dir_reports_throughput(self, capsys):
+        cp({'r'}, ['dir1', 'dir_copy'])
+        captured = capsys.readouterr()
+
+        assert 'Скопировано файлов: 1' in captured.out
+        assert '/с' in captured.out
+
+    def test_cp_dir_verbose(self, capsys):
+        cp({'r', 'v'}, ['dir1', 'dir_copy'])
+        captured = capsys.readouterr()
+
+        assert Path('dir_copy', 'nested.txt').read_text() == 'Nested'
+        assert 'nested.txt' in captured.out
+
+
+class TestCopyEngine:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self, monkeypatch):
+        self.test_dir = tempfile.mkdtemp()
+        self.src = os.path.join(self.test_dir, 'src.bin')
+        self.dst = os.path.join(self.test_dir, 'dst.bin')
+        self.data = os.urandom(300_000)
+        Path(self.src).write_bytes(self.data)
+        monkeypatch.setattr(src.config.copy_engine, 'COPY_BUFFER_SIZE', 4096)
+
+        yield
+
+        shutil.rmtree(self.test_dir)
+
+    def unsupported(self, *args):
+        raise OSError('не поддерживается')
+
+    def test_copy_prefers_copy_file_range(self):
+        if not hasattr(os, 'copy_file_range'):
+            pytest.skip('нет os.copy_file_range')
+
+        method = copy_file(self.src, self.dst)
+
+        assert method == 'copy_file_range'
+        assert Path(self.dst).read_bytes() == self.data
+
+    def test_copy_falls_back_to_sendfile(self, monkeypatch):
+        if not hasattr(os, 'sendfile'):
+            pytest.skip('нет os.sendfile')
+        monkeypatch.setattr(os, 'copy_file_range', self.unsupported, False)
+
+        method = copy_file(self.src, self.dst)
+
+        assert method == 'sendfile'
+        assert Path(self.dst).read_bytes() == self.data
+
+    def test_copy_falls_back_to_buffer(self, monkeypatch):
+        monkeypatch.setattr(os, 'copy_file_range', self.unsupported, False)
+        monkeypatch.setattr(os, 'sendfile', self.unsupported, False)
+
+        method = copy_file(self.src, self.dst)
+
+        assert method == 'readinto'
+        assert Path(self.dst).read_bytes() == self.data
+
+    def test_copy_reflink_or_fallback(self):
+        method = copy_file(self.src, self.dst, reflink=True)
+
+        assert method in (
+            'reflink', 'copy_file_range', 'sendfile', 'readinto'
+        )
+        assert Path(self.dst).read_bytes() == self.data
+
+    def test_copy_without_unix_calls(self, monkeypatch):
+        for name in ('copy_file_range', 'sendfile', 'readv', 'preadv',
+                     'pread', 'pwrite', 'posix_fadvise'):
+            monkeypatch.delattr(os, name, raising=False)
+
+        assert copy_file(self.src, self.dst, verify=True) == 'verify'
+        assert copy_file(self.src, self.dst) == 'readinto'
+        Path(self.src).write_bytes(self.data[::-1])
+        src.config.copy_engine.update_blocks(self.src, self.dst, verify=True)
+
+        assert Path(self.dst).read_bytes() == self.data[::-1]
+
+    def test_copy_skips_method_that_copies_nothing(self, monkeypatch):
+        monkeypatch.setattr(os, 'copy_file_range', lambda *args: 0, False)
+        monkeypatch.setattr(os, 'sendfile', self.unsupported, False)
+
+        method = copy_file(self.src, self.dst)
+
+        assert method == 'readinto'
+        assert Path(self.dst).read_bytes() == self.data
+
+    def test_copy_empty_file(self):
+        Path(self.src).write_bytes(b'')
+
+        copy_file(self.src, self.dst)
+
+        assert Path(self.dst).read_bytes() == b''
+
+    def test_copy_metadata(self):
+        os.utime(self.src, (1000, 2000))
+
+        copy_file(self.src, self.dst, metadata=True)
+
+        assert os.stat(self.dst).st_mtime == 2000
+
+    def test_copy_reports_progress(self):
+        chunks = []
+        copy_file(self.src, self.dst, progress=chunks.append)
+
+        assert sum(chunks) == os.path.getsize(self.src)
+
+    def copy_with_size(self, src_path, dst_path):
+        copy_file(src_path, dst_path)
+        return os.path.getsize(dst_path)
+
+    def make_tree(self):
+        tree = os.path.join(self.test_dir, 'tree')
+        for i in range(3):
+            Path(tree, f'd{i}', 'inner').mkdir(parents=True)
+            for j in range(5):
+                Path(tree, f'd{i}', f'f{j}.txt').write_text('x' * (i + j))
+            Path(tree, f'd{i}', 'inner', 'deep.txt').write_text('deep')
+        Path(tree, 'empty').mkdir()
+        os.utime(os.path.join(tree, 'd1'), (1000, 1000))
+        return tree
+
+    def test_copy_tree(self):
+        tree = self.make_tree()
+        target = os.path.join(self.test_dir, 'copy')
+
+        copied, skipped, size = copy_tree(
+            tree, target, self.copy_with_size, workers=4
+        )
+
+        assert (copied, skipped) == (18, 0)
+        assert size == sum(i + j for i in range(3) for j in range(5)) + 12
+        assert Path(target, 'd2', 'f4.txt').read_text() == 'x' * 6
+        assert Path(target, 'empty').is_dir()
+        assert os.stat(os.path.join(target, 'd1')).st_mtime == 1000
+
+    def test_copy_tree_collects_errors(self):
+        tree = self.make_tree()
+        os.symlink('missing', os.path.join(tree, 'broken'))
+        target = os.path.join(self.test_dir, 'copy')
+
+        with pytest.raises(shutil.Error) as error:
+            copy_tree(tree, target, self.copy_with_size)
+
+        assert len(error.value.args[0]) == 1
+        assert Path(target, 'd0', 'f0.txt').exists()
+
+    def test_copy_tree_skips_fifo(self):
+        tree = self.make_tree()
+        os.mkfifo(os.path.join(tree, 'd0', 'pipe'))
+        target = os.path.join(self.test_dir, 'copy')
+
+        with pytest.raises(shutil.Error) as error:
+            copy_tree(tree, target, self.copy_with_size)
+
+        [(source, _, message)] = error.value.args[0]
+        assert source == os.path.join(tree, 'd0', 'pipe')
+        assert 'не обычный файл' in message
+        assert not Path(target, 'd0', 'pipe').exists()
+        assert Path(target, 'd2', 'inner', 'deep.txt').exists()
+
+    def test_copy_tree_symlink_loop(self):
+        tree = self.make_tree()
+        os.symlink('..', os.path.join(tree, 'd0', 'up'))
+        target = os.path.join(self.test_dir, 'copy')
+
+        copied, _, _ = copy_tree(tree, target, self.copy_with_size)
+
+        assert copied == 18
+
+    def test_update_blocks_rewrites_changed_blocks(self, monkeypatch):
+        monkeypatch.setattr(src.config.copy_engine, 'CHUNK_SIZE', 1000)
+        changed = bytearray(self.data)
+        changed[5500] ^= 0xFF
+        Path(self.dst).write_bytes(bytes(changed) + b'tail')
+
+        written = src.config.copy_engine.update_blocks(self.src, self.dst)
+
+        assert written == 1000
+        assert Path(self.dst).read_bytes() == self.data
+        assert src.config.copy_engine.is_up_to_date(self.src, self.dst)
+
+
+class TestCpUpdate:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+        src.config.consts.FOR_UNDO_HISTORY.clear()
+
+        Path('tree', 'sub').mkdir(parents=True)
+        Path('tree', 'a.txt').write_text('aaa')
+        Path('tree', 'sub', 'b.txt').write_text('bbb')
+        Path('mirror').mkdir()
+
+        yield
+
+        src.config.consts.FOR_UNDO_HISTORY.clear()
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+
+    def test_update_skips_unchanged(self, capsys):
+        cp({'r'}, ['tree', 'mirror'])
+        capsys.readouterr()
+
+        cp({'r', 'update'}, ['tree', 'mirror'])
+        captured = capsys.readouterr()
+
+        assert 'Скопировано файлов: 0, пропущено: 2' in captured.out
+
+    def test_update_copies_changed(self, capsys):
+        cp({'r'}, ['tree', 'mirror'])
+        Path('tree', 'a.txt').write_text('changed')
+        os.utime(Path('tree', 'a.txt'), (5000, 5000))
+        capsys.readouterr()
+
+        cp({'r', 'u'}, ['tree', 'mirror'])
+        captured = capsys.readouterr()
+
+        assert 'Скопировано файлов: 1, пропущено: 1' in captured.out
+        assert Path('mirror', 'tree', 'a.txt').read_text() == 'changed'
+        assert os.stat(Path('mirror', 'tree', 'a.txt')).st_mtime == 5000
+
+    def test_update_tolerates_coarse_mtime(self, capsys):
+        cp({'u'}, [os.path.join('tree', 'a.txt'), 'copy.txt'])
+        mtime_ns = os.stat(Path('tree', 'a.txt')).st_mtime_ns
+        os.utime('copy.txt', ns=(mtime_ns, mtime_ns - 999_999_999))
+        capsys.readouterr()
+
+        cp({'u', 'v'}, [os.path.join('tree', 'a.txt'), 'copy.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out.strip().endswith('(skipped)')
+
+    def test_update_single_file(self, capsys):
+        cp({'u', 'v'}, [os.path.join('tree', 'a.txt'), 'copy.txt'])
+        cp({'u', 'v'}, [os.path.join('tree', 'a.txt'), 'copy.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out.splitlines()[-1].endswith('(skipped)')
+
+    def test_delta_rewrites_changed_file(self, capsys):
+        cp({'r'}, ['tree', 'mirror'])
+        Path('tree', 'sub', 'b.txt').write_text('bbc')
+        os.utime(Path('tree', 'sub', 'b.txt'), (5000, 5000))
+
+        cp({'r', 'delta', 'v'}, ['tree', 'mirror'])
+        captured = capsys.readouterr()
+
+        assert '(delta)' in captured.out
+        assert Path('mirror', 'tree', 'sub', 'b.txt').read_text() == 'bbc'
+
+    def test_update_existing_destination_not_undone(self):
+        cp({'r'}, ['tree', 'mirror'])
+        cp({'r', 'u'}, ['tree', 'mirror'])
+
+        assert len(src.config.consts.FOR_UNDO_HISTORY) == 1
+
+    def test_without_update_destination_must_not_exist(self):
+        cp({'r'}, ['tree', 'mirror'])
+
+        with pytest.raises(src.config.exceptions.AlreadyExists):
+            cp({'r'}, ['tree', 'mirror'])
+
+
+class TestCpLink:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+        src.config.consts.FOR_UNDO_HISTORY.clear()
+
+        Path('tree', 'sub').mkdir(parents=True)
+        Path('tree', 'a.txt').write_text('aaa')
+        Path('tree', 'sub', 'b.txt').write_text('bbb')
+
+        yield
+
+        src.config.consts.FOR_UNDO_HISTORY.clear()
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+
+    def test_link_file(self, capsys):
+        cp({'link', 'v'}, [os.path.join('tree', 'a.txt'), 'linked.txt'])
+        captured = capsys.readouterr()
+
+        assert os.path.samefile(Path('tree', 'a.txt'), 'linked.txt')
+        assert captured.out.strip().endswith('(link)')
+
+    def test_link_tree(self):
+        cp({'r', 'l'}, ['tree', 'linked'])
+
+        assert os.path.samefile(
+            Path('tree', 'sub', 'b.txt'), Path('linked', 'sub', 'b.txt')
+        )
+        assert os.stat(Path('tree', 'a.txt')).st_nlink == 2
+
+    def test_undo_link_keeps_source(self):
+        cp({'r', 'link'}, ['tree', 'linked'])
+        undo(set(), [])
+
+        assert not Path('linked').exists()
+        assert Path('tree', 'a.txt').read_text() == 'aaa'
+        assert os.stat(Path('tree', 'a.txt')).st_nlink == 1
+
+    def test_reflink_auto_falls_back(self, monkeypatch):
+        monkeypatch.setattr(
+            src.config.copy_engine, 'clone_data', lambda *args: False
+        )
+        cp({'reflink=auto', 'v'}, [os.path.join('tree', 'a.txt'), 'c.txt'])
+
+        assert Path('c.txt').read_text() == 'aaa'
+        assert not os.path.samefile(Path('tree', 'a.txt'), 'c.txt')
+
+    def test_reflink_reported(self, monkeypatch, capsys):
+        def clone(in_fd, out_fd):
+            os.write(out_fd, os.read(in_fd, 100))
+            return True
+
+        monkeypatch.setattr(src.config.copy_engine, 'clone_data', clone)
+        cp({'reflink', 'v'}, [os.path.join('tree', 'a.txt'), 'c.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out.strip().endswith('(reflink)')
+        assert Path('c.txt').read_text() == 'aaa'
+
+    def test_undo_reflink(self):
+        cp({'reflink=auto'}, [os.path.join('tree', 'a.txt'), 'c.txt'])
+        undo(set(), [])
+
+        assert not Path('c.txt').exists()
+        assert Path('tree', 'a.txt').exists()
+
+    def test_reflink_wrong_value(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            cp({'reflink=always'}, [os.path.join('tree', 'a.txt'), 'c.txt'])
+
+    def test_link_with_reflink(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            cp({'link', 'reflink'}, [os.path.join('tree', 'a.txt'), 'c.txt'])
+
+    def test_link_with_update(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            cp({'l', 'u'}, [os.path.join('tree', 'a.txt'), 'c.txt'])
+
+
+class TestCpVerify:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+        src.config.consts.FOR_UNDO_HISTORY.clear()
+
+        Path('tree', 'sub').mkdir(parents=True)
+        Path('tree', 'a.txt').write_bytes(os.urandom(3 * 1024 * 1024 + 5))
+        Path('tree', 'sub', 'b.txt').write_text('bbb')
+        Path('mirror').mkdir()
+
+        yield
+
+        src.config.consts.FOR_UNDO_HISTORY.clear()
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+
+    def corrupt(self, fd):
+        return b'corrupted'
+
+    def test_verify_file(self, capsys):
+        cp({'verify', 'v'}, [os.path.join('tree', 'a.txt'), 'copy.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out.strip().endswith('(verify)')
+        assert Path('copy.txt').read_bytes() == Path('tree', 'a.txt').read_bytes()
+
+    def test_verify_hashes_copied_blocks(self):
+        data = Path('tree', 'a.txt').read_bytes()
+        digest = hashlib.new(src.config.consts.VERIFY_ALGORITHM)
+        with open(Path('tree', 'a.txt'), 'rb') as fsrc:
+            with open('copy.txt', 'wb') as fdst:
+                src.config.copy_engine.read_range(
+                    fsrc.fileno(), fdst.fileno(), digest=digest.update
+                )
+
+        assert digest.digest() == hashlib.new(
+            src.config.consts.VERIFY_ALGORITHM, data
+        ).digest()
+
+    def test_verify_mismatch(self, monkeypatch):
+        monkeypatch.setattr(
+            src.config.copy_engine, 'file_digest', self.corrupt
+        )
+
+        with pytest.raises(src.config.exceptions.ChecksumMismatch):
+            cp({'verify'}, [os.path.join('tree', 'a.txt'), 'copy.txt'])
+
+    def test_verify_tree_mismatch_collected(self, monkeypatch):
+        monkeypatch.setattr(
+            src.config.copy_engine, 'file_digest', self.corrupt
+        )
+
+        with pytest.raises(src.config.exceptions.ChecksumMismatch) as error:
+            cp({'r', 'verify'}, ['tree', 'copy'])
+
+        assert 'файлов: 2' in str(error.value)
+        assert os.path.join('copy', 'sub', 'b.txt') in str(error.value)
+
+    def test_verify_tree_mismatch_with_other_errors(self, monkeypatch):
+        monkeypatch.setattr(
+            src.config.copy_engine, 'file_digest', self.corrupt
+        )
+        os.mkfifo(Path('tree', 'sub', 'pipe'))
+
+        with pytest.raises(shutil.Error) as error:
+            cp({'r', 'verify'}, ['tree', 'copy'])
+
+        assert len(error.value.args[0]) == 3
+
+    def test_verify_tree(self, capsys):
+        cp({'r', 'verify'}, ['tree', 'copy'])
+        captured = capsys.readouterr()
+
+        assert 'Скопировано файлов: 2' in captured.out
+        assert Path('copy', 'sub', 'b.txt').read_text() == 'bbb'
+
+    def test_verify_delta(self, monkeypatch):
+        cp({'r'}, ['tree', 'mirror'])
+        Path('tree', 'sub', 'b.txt').write_text('bbc')
+        os.utime(Path('tree', 'sub', 'b.txt'), (5000, 5000))
+        cp({'r', 'delta', 'verify'}, ['tree', 'mirror'])
+
+        assert Path('mirror', 'tree', 'sub', 'b.txt').read_text() == 'bbc'
+
+        Path('tree', 'sub', 'b.txt').write_text('bcc')
+        monkeypatch.setattr(
+            src.config.copy_engine, 'file_digest', self.corrupt
+        )
+        with pytest.raises(src.config.exceptions.ChecksumMismatch):
+            cp({'r', 'delta', 'verify'}, ['tree', 'mirror'])
+
+    def test_verify_with_link(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            cp({'verify', 'l'}, [os.path.join('tree', 'a.txt'), 'c.txt'])
+
+    def test_verify_with_reflink(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            cp({'verify', 'reflink'}, [os.path.join('tree', 'a.txt'), 'c.txt'])
@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import src.config.exceptions
+from src.utilities.du import disk_usage, du
+
+
+class TestDuCommand:
+    """Набор тестов для команды du."""
+
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+
+        self.root = os.path.join(self.test_dir, 'data')
+        Path(self.root, 'sub', 'deep').mkdir(parents=True)
+        Path(self.root, 'a.bin').write_bytes(b'a' * 10000)
+        Path(self.root, 'sub', 'b.bin').write_bytes(b'b' * 50000)
+        Path(self.root, 'sub', 'deep', 'c.bin').write_bytes(b'c' * 70000)
+
+        yield
+
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+
+    def usage(self, *parts):
+        return disk_usage(os.lstat(os.path.join(self.root, *parts)))
+
+    def parse(self, out):
+        result = {}
+        for line in out.splitlines():
+            size, path = line.split('\t')
+            result[path] = size
+        return result
+
+    def test_du_per_directory_totals(self, capsys):
+        du(set(), ['data'])
+        result = self.parse(capsys.readouterr().out)
+
+        deep = self.usage('sub', 'deep') + self.usage('sub', 'deep', 'c.bin')
+        sub = self.usage('sub') + self.usage('sub', 'b.bin') + deep
+        total = self.usage() + self.usage('a.bin') + sub
+        assert result == {
+            os.path.join(self.root, 'sub', 'deep'): str(deep),
+            os.path.join(self.root, 'sub'): str(sub),
+            self.root: str(total),
+        }
+
+    def test_du_children_before_parent(self, capsys):
+        du(set(), ['data'])
+        lines = capsys.readouterr().out.splitlines()
+
+        paths = [line.split('\t')[1] for line in lines]
+        assert paths[-1] == self.root
+        assert paths.index(os.path.join(self.root, 'sub', 'deep')) < (
+            paths.index(os.path.join(self.root, 'sub'))
+        )
+
+    def test_du_summarize(self, capsys):
+        du({'s'}, ['data'])
+        result = self.parse(capsys.readouterr().out)
+
+        assert list(result) == [self.root]
+
+    def test_du_trailing_separator(self, capsys):
+        du({'depth=1'}, ['data' + os.sep])
+        du(set(), [self.root + os.sep])
+        result = self.parse(capsys.readouterr().out)
+
+        assert self.root in result
+        assert os.path.join(self.root, 'sub', 'deep') in result
+
+    def test_du_depth(self, capsys):
+        du({'depth=1'}, ['data'])
+        result = self.parse(capsys.readouterr().out)
+
+        assert set(result) == {self.root, os.path.join(self.root, 'sub')}
+
+    def test_du_hardlinks_counted_once(self, capsys):
+        du({'s'}, ['data'])
+        before = int(self.parse(capsys.readouterr().out)[self.root])
+
+        os.link(
+            os.path.join(self.root, 'sub', 'b.bin'),
+            os.path.join(self.root, 'link.bin'),
+        )
+        du({'s'}, ['data'])
+        after = int(self.parse(capsys.readouterr().out)[self.root])
+
+        assert after == before
+
+    def test_du_human_readable(self, capsys):
+        du({'s', 'h'}, ['data'])
+        size = capsys.readouterr().out.split('\t')[0]
+
+        assert size[-1] == 'K'
+
+    def test_du_file(self, capsys):
+        du(set(), [os.path.join('data', 'a.bin')])
+        captured = capsys.readouterr()
+
+        assert captured.out.startswith(str(self.usage('a.bin')))
+
+    def test_du_depth_without_value(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            du({'depth'}, ['data'])
+
+    def test_du_incorrect_flag(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            du({'x'}, ['data'])
+
+    def test_du_nonexistent_path(self):
+        with pytest.raises(src.config.exceptions.PathError):
+            du(set(), ['missing'])
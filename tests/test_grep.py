@@ -1,12 +1,14 @@
 import os
 import shutil
 import tempfile
+import zipfile
 from pathlib import Path
 
 import pytest
 
 import src.config.exceptions
-from src.utilities.grep import grep
+import src.utilities.grep
+from src.utilities.grep import Matcher, grep, iter_matches
 
 
 class TestGrepCommand:
@@ -68,6 +70,14 @@ class TestGrepCommand:
         assert '1 Hello World' in captured.out
         assert '1 Hello from subdir' in captured.out
 
+    def test_grep_r_directory_symlink(self, capsys):
+        Path(self.test_dir, 'links').mkdir()
+        Path(self.test_dir, 'links', 'sub').symlink_to(Path('..', 'subdir'))
+        grep({'r'}, ['Hello', 'links'])
+        captured = capsys.readouterr()
+
+        assert '1 Hello from subdir' in captured.out
+
     def test_grep_flag_r_i(self, capsys):
         grep({'r', 'i'}, ['heLLo', self.test_dir])
         captured = capsys.readouterr()
@@ -126,11 +136,13 @@ class TestGrepCommand:
         grep({'i'}, ['[worLD', 'test.txt'])
         captured = capsys.readouterr()
 
-        assert '1 hello [world]' in captured.out
+        assert '1 Hello [World]' in captured.out
 
     def test_grep_complex_regex(self, capsys):
         email_file = Path(self.test_dir, 'emails.txt')
-        email_file.write_text('Contact: user@example.com\nInvalid: not an email\n')
+        email_file.write_text(
+            'Contact: user@example.com\nInvalid: not an email\n'
+        )
         grep(set(), [r'\w+@\w+\.\w+', 'emails.txt'])
         captured = capsys.readouterr()
 
@@ -147,8 +159,316 @@ class TestGrepCommand:
 
         assert 'Deep content' in captured.out
 
+    def test_grep_exclude(self, capsys):
+        grep({'r', 'exclude=subdir,*.py'}, ['Hello', self.test_dir])
+        captured = capsys.readouterr()
+
+        assert '1 Hello World' in captured.out
+        assert 'Hello from subdir' not in captured.out
+
+    def test_grep_binary_file(self, capsys):
+        Path(self.test_dir, 'data.bin').write_bytes(b'\x00\x01Hello\nHello\n')
+        grep(set(), ['Hello', 'data.bin'])
+        captured = capsys.readouterr()
+
+        assert captured.out.endswith('data.bin совпадает\n')
+        assert captured.out.count('совпадает') == 1
+
+    def test_grep_binary_match_across_chunks(self, capsys, monkeypatch):
+        monkeypatch.setattr(src.utilities.grep, 'CHUNK_SIZE', 16)
+        data = b'\x00' + b'x' * 12 + b'needle' + b'x' * 40
+        Path(self.test_dir, 'data.bin').write_bytes(data)
+        Path(self.test_dir, 'split.bin').write_bytes(b'\x00nee\ndle')
+        grep(set(), ['needle', 'data.bin'])
+        grep(set(), ['needle', 'split.bin'])
+        captured = capsys.readouterr()
+
+        assert captured.out.count('совпадает') == 1
+        assert 'data.bin совпадает' in captured.out
+
+    def test_grep_binary_file_skip(self, capsys):
+        Path(self.test_dir, 'data.bin').write_bytes(b'\x00\x01Hello\n')
+        grep({'r', 'I'}, ['Hello', self.test_dir])
+        captured = capsys.readouterr()
+
+        assert 'data.bin' not in captured.out
+        assert '1 Hello World' in captured.out
+
+    def test_grep_binary_file_as_text(self, capsys):
+        Path(self.test_dir, 'data.bin').write_bytes(b'\x00\x01\nHello\xff\n')
+        grep({'text'}, ['Hello', 'data.bin'])
+        captured = capsys.readouterr()
+
+        assert 'data.bin: 2 Hello' in captured.out
+
+    def test_grep_non_utf8_file(self, capsys):
+        Path(self.test_dir, 'latin.txt').write_bytes(b'caf\xe9 Hello\n')
+        grep(set(), ['Hello', 'latin.txt'])
+        captured = capsys.readouterr()
+
+        assert '1 caf\ufffd Hello' in captured.out
+
+    def test_grep_files_with_matches(self, capsys):
+        grep({'r', 'l'}, ['Hello', self.test_dir])
+        captured = capsys.readouterr()
+
+        assert sorted(captured.out.splitlines()) == [
+            os.path.join(self.test_dir, 'file1.txt'),
+            os.path.join(self.test_dir, 'subdir', 'file3.txt'),
+        ]
+
+    def test_grep_count(self, capsys):
+        Path(self.test_dir, 'many.txt').write_text('a\nab\nb\nab\n')
+        grep({'count'}, ['a', 'many.txt', 'file1.txt'])
+        captured = capsys.readouterr()
+
+        assert 'many.txt: 3' in captured.out
+        assert 'file1.txt: 0' in captured.out
+
+    def test_grep_max_count(self, capsys):
+        Path(self.test_dir, 'many.txt').write_text('a\nab\nb\nab\n')
+        grep({'m=2'}, ['a', 'many.txt'])
+        captured = capsys.readouterr()
+
+        assert '1 a' in captured.out
+        assert '2 ab' in captured.out
+        assert '4 ab' not in captured.out
+
+    def test_grep_max_count_with_count(self, capsys):
+        Path(self.test_dir, 'many.txt').write_text('a\nab\nb\nab\n')
+        grep({'c', 'max-count=2'}, ['a', 'many.txt'])
+        captured = capsys.readouterr()
+
+        assert 'many.txt: 2' in captured.out
+
+    def test_grep_max_count_without_value(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            grep({'m'}, ['a', 'file1.txt'])
+
+    def test_grep_quiet(self, capsys):
+        assert grep({'r', 'q'}, ['Hello', self.test_dir]) is True
+        assert grep({'quiet'}, ['NotFound', 'file1.txt']) is False
+        captured = capsys.readouterr()
+
+        assert not captured.out
+
+    def test_grep_context(self, capsys):
+        Path(self.test_dir, 'log.txt').write_text(
+            ''.join(f'line {i}\n' for i in range(1, 11))
+            .replace('line 3', 'ERROR 3')
+            .replace('line 8', 'ERROR 8')
+        )
+        grep({'C=1'}, ['ERROR', 'log.txt'])
+        captured = capsys.readouterr()
+
+        lines = captured.out.replace(self.test_dir + os.sep, '').splitlines()
+        assert lines == [
+            'log.txt- 2 line 2',
+            'log.txt: 3 ERROR 3',
+            'log.txt- 4 line 4',
+            '--',
+            'log.txt- 7 line 7',
+            'log.txt: 8 ERROR 8',
+            'log.txt- 9 line 9',
+        ]
+
+    def test_grep_context_merges_groups(self, capsys):
+        Path(self.test_dir, 'log.txt').write_text('a\nERROR\nb\nERROR\nc\n')
+        grep({'A=1', 'B=1'}, ['ERROR', 'log.txt'])
+        captured = capsys.readouterr()
+
+        assert '--' not in captured.out
+        assert len(captured.out.splitlines()) == 5
+
+    def test_grep_after_context_with_max_count(self, capsys):
+        Path(self.test_dir, 'log.txt').write_text('ERROR 1\nok\nERROR 2\nok\n')
+        grep({'after-context=1', 'm=1'}, ['ERROR', 'log.txt'])
+        captured = capsys.readouterr()
+
+        lines = captured.out.replace(self.test_dir + os.sep, '').splitlines()
+        assert lines == ['log.txt: 1 ERROR 1', 'log.txt- 2 ok']
+
+    def test_grep_before_context_at_file_start(self, capsys):
+        grep({'B=5'}, ['Python', 'file1.txt'])
+        captured = capsys.readouterr()
+
+        lines = captured.out.replace(self.test_dir + os.sep, '').splitlines()
+        assert lines == [
+            'file1.txt- 1 Hello World',
+            'file1.txt: 2 Python',
+        ]
+
+    def test_grep_context_without_value(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            grep({'C'}, ['Hello', 'file1.txt'])
+
+    def test_grep_archives_zip(self, capsys):
+        with zipfile.ZipFile('logs.zip', 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('app/today.log', 'ok\nHello archive\n')
+            archive.writestr('app/other.log', 'nothing\n')
+        grep({'archives'}, ['Hello', 'logs.zip'])
+        captured = capsys.readouterr()
+
+        assert 'logs.zip!app/today.log: 2 Hello archive' in captured.out
+        assert 'other.log' not in captured.out
+        assert not Path(self.test_dir, 'app').exists()
+
+    def test_grep_archives_tar_gz(self, capsys):
+        shutil.make_archive('logs', 'gztar', self.test_dir, 'subdir')
+        grep({'r', 'archives', 'l'}, ['Hello', self.test_dir])
+        captured = capsys.readouterr()
+
+        assert 'logs.tar.gz!subdir/file3.txt' in captured.out
+        assert os.path.join(self.test_dir, 'file1.txt') in captured.out
+
+    def test_grep_archive_without_flag(self):
+        with zipfile.ZipFile('logs.zip', 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('today.log', 'Hello archive\n')
+        assert grep({'q'}, ['Hello archive', 'logs.zip']) is False
+        assert grep({'q', 'archives'}, ['Hello archive', 'logs.zip']) is True
+
     def test_grep_first_arg_is_file(self, capsys):
         grep(set(), ['file1.txt'])
         captured = capsys.readouterr()
 
         assert not captured.out
+
+    def test_grep_jobs(self, capsys):
+        grep({'r'}, ['Hello', self.test_dir])
+        sequential = capsys.readouterr().out
+
+        grep({'r', 'jobs=2'}, ['Hello', self.test_dir])
+        parallel = capsys.readouterr().out
+
+        assert parallel == sequential
+
+    def test_grep_jobs_short(self, capsys):
+        grep({'j=2'}, ['World', 'file1.txt', 'file2.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out.index('Hello') < captured.out.index('Goodbye')
+
+    def test_grep_jobs_incorrect_value(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            grep({'jobs=many'}, ['Hello', 'file1.txt'])
+
+    def test_iter_matches_is_lazy(self):
+        big = Path(self.test_dir, 'big.txt')
+        big.write_text('needle\n' + 'hay\n' * 100000)
+        with open(big, 'rb') as stream:
+            matches = iter_matches(stream, Matcher('needle'), set())
+
+            assert next(matches) == (1, 'needle\n')
+            assert list(matches) == []
+
+
+class TestMatcher:
+    def test_literal(self):
+        matcher = Matcher('Hello')
+
+        assert matcher.strategy == 'literal'
+        assert matcher.search('Hello World')
+        assert not matcher.search('hello world')
+
+    def test_casefold(self):
+        matcher = Matcher('heLLo', ignore_case=True)
+
+        assert matcher.strategy == 'casefold'
+        assert matcher.search('HELLO world')
+
+    def test_regex(self):
+        matcher = Matcher(r'P\w+')
+
+        assert matcher.strategy == 'regex'
+        assert matcher.search('Python')
+        assert not matcher.search('python')
+
+    def test_invalid_regex_is_literal(self):
+        matcher = Matcher('[')
+
+        assert matcher.strategy == 'literal'
+        assert matcher.search('Hello [World]')
+
+    def test_timings(self, tmp_path, capsys):
+        path = tmp_path / 'file.txt'
+        path.write_text('Hello\n')
+        grep({'stats'}, ['Hello', str(path)])
+        captured = capsys.readouterr()
+
+        assert 'Стратегия: literal' in captured.out
+
+
+class TestGrepPatternFile:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+
+        Path(self.test_dir, 'patterns.txt').write_text('Hello\nJava\n\n[\n')
+        Path(self.test_dir, 'file1.txt').write_text('Hello World\nPython\n')
+        Path(self.test_dir, 'file2.txt').write_text('Goodbye [World]\nJava\n')
+
+        yield
+
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+
+    def test_grep_pattern_file(self, capsys):
+        grep({'f=patterns.txt'}, ['file1.txt', 'file2.txt'])
+        captured = capsys.readouterr()
+
+        assert 'file1.txt: 1 [Hello] Hello World' in captured.out
+        assert 'file2.txt: 1 [[] Goodbye [World]' in captured.out
+        assert 'file2.txt: 2 [Java] Java' in captured.out
+        assert 'Python' not in captured.out
+
+    def test_grep_pattern_file_several_hits(self, capsys):
+        Path(self.test_dir, 'both.txt').write_text('Hello Java\n')
+        grep({'file=patterns.txt'}, ['both.txt'])
+        captured = capsys.readouterr()
+
+        assert '1 [Hello, Java] Hello Java' in captured.out
+
+    def test_grep_pattern_file_ignore_case(self, capsys):
+        grep({'i', 'f=patterns.txt'}, ['file2.txt'])
+        captured = capsys.readouterr()
+
+        assert '[Java] Java' in captured.out
+
+    def test_grep_pattern_file_overlapping(self, capsys):
+        Path(self.test_dir, 'patterns.txt').write_text('foo\nfoobar\n')
+        Path(self.test_dir, 'foo.txt').write_text('foobar\n')
+        grep({'f=patterns.txt'}, ['foo.txt'])
+        captured = capsys.readouterr()
+
+        assert '1 [foo, foobar] foobar' in captured.out
+
+    def test_grep_pattern_file_inline_flags(self, capsys):
+        Path(self.test_dir, 'patterns.txt').write_text('(?i)hello\nJava\n')
+        grep({'f=patterns.txt'}, ['file1.txt', 'file2.txt'])
+        captured = capsys.readouterr()
+
+        assert '1 [(?i)hello] Hello World' in captured.out
+        assert '2 [Java] Java' in captured.out
+
+    def test_grep_pattern_file_groups(self, capsys):
+        Path(self.test_dir, 'patterns.txt').write_text(
+            '(?P<x>Py)thon\n(?P<x>Ja)va\n(o)\\1\n'
+        )
+        Path(self.test_dir, 'book.txt').write_text('book\nbox\n')
+        grep({'f=patterns.txt'}, ['file1.txt', 'file2.txt', 'book.txt'])
+        captured = capsys.readouterr()
+
+        assert '2 [(?P<x>Py)thon] Python' in captured.out
+        assert '2 [(?P<x>Ja)va] Java' in captured.out
+        assert 'book.txt: 1 [(o)\\1] book' in captured.out
+        assert 'box' not in captured.out
+
+    def test_grep_pattern_file_without_value(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            grep({'f'}, ['file1.txt'])
+
+    def test_grep_pattern_file_nonexist(self):
+        with pytest.raises(src.config.exceptions.PathError):
+            grep({'f=haha.txt'}, ['file1.txt'])
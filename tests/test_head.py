@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import src.config.exceptions
+import src.utilities.head
+from src.utilities.head import head
+
+
+class TestHeadCommand:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+
+        lines = ''.join(f'line {i}\n' for i in range(1, 31))
+        Path(self.test_dir, 'long.txt').write_text(lines)
+        Path(self.test_dir, 'short.txt').write_text('one\ntwo')
+        Path(self.test_dir, 'empty.txt').touch()
+        Path(self.test_dir, 'subdir').mkdir()
+
+        yield
+
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+
+    def test_head_default_lines(self, capsys):
+        head(set(), ['long.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == ''.join(f'line {i}\n' for i in range(1, 11))
+
+    def test_head_n(self, capsys):
+        head({'n=3'}, ['long.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == 'line 1\nline 2\nline 3\n'
+
+    def test_head_lines_across_chunks(self, capsys, monkeypatch):
+        monkeypatch.setattr(src.utilities.head, 'CHUNK_SIZE', 5)
+
+        head({'lines=2'}, ['long.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == 'line 1\nline 2\n'
+
+    def test_head_more_than_file(self, capsys):
+        head({'n=10'}, ['short.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == 'one\ntwo\n'
+
+    def test_head_zero_and_empty(self, capsys):
+        head({'n=0'}, ['long.txt'])
+        head(set(), ['empty.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == ''
+
+    def test_head_several_files(self, capsys):
+        head({'n=1'}, ['long.txt', 'short.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == (
+            '==> long.txt <==\nline 1\n==> short.txt <==\none\n'
+        )
+
+    def test_head_n_without_value(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            head({'n'}, ['long.txt'])
+
+    def test_head_incorrect_value(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            head({'n=-1'}, ['long.txt'])
+
+    def test_head_empty_paths(self):
+        with pytest.raises(src.config.exceptions.IncorrectInput):
+            head(set(), [])
+
+    def test_head_dir(self):
+        with pytest.raises(src.config.exceptions.IsNotFile):
+            head(set(), ['subdir'])
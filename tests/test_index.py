@@ -0,0 +1,198 @@
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+import src.config.consts
+import src.config.exceptions
+import src.utilities.index
+from src.utilities.grep import grep
+from src.utilities.index import build_index, find_candidates, index
+
+
+class TestIndexCommand:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self, monkeypatch):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+        monkeypatch.setattr(
+            src.config.consts, 'INDEX_PATH', os.path.join(self.test_dir, '.index')
+        )
+
+        self.data_dir = Path(self.test_dir, 'data')
+        self.data_dir.mkdir()
+        Path(self.data_dir, 'file1.txt').write_text('Hello World\nPython\n')
+        Path(self.data_dir, 'file2.txt').write_text('Goodbye World\nJava\n')
+        Path(self.data_dir, 'subdir').mkdir()
+        Path(self.data_dir, 'subdir', 'file3.txt').write_text('Hello from subdir\n')
+
+        yield
+
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+
+    def test_index_build(self, capsys):
+        index(set(), ['build', 'data'])
+        captured = capsys.readouterr()
+
+        assert 'файлов в индексе 3, обновлено 3' in captured.out
+
+    def test_index_build_incremental(self):
+        build_index(str(self.data_dir))
+        time.sleep(0.01)
+        Path(self.data_dir, 'file2.txt').write_text('Hello again\n')
+        total, updated = build_index(str(self.data_dir))
+
+        assert (total, updated) == (3, 1)
+        assert find_candidates(str(self.data_dir), ['hello again']) == [
+            str(Path(self.data_dir, 'file2.txt'))
+        ]
+
+    def test_index_removed_file(self):
+        build_index(str(self.data_dir))
+        Path(self.data_dir, 'file1.txt').unlink()
+        total, updated = build_index(str(self.data_dir))
+
+        assert (total, updated) == (2, 0)
+        assert find_candidates(str(self.data_dir), ['Python']) == []
+
+    def test_find_candidates(self):
+        build_index(str(self.data_dir))
+
+        assert find_candidates(str(self.data_dir), ['Hello']) == [
+            str(Path(self.data_dir, 'file1.txt')),
+            str(Path(self.data_dir, 'subdir', 'file3.txt')),
+        ]
+
+    def test_find_candidates_short_literal(self):
+        build_index(str(self.data_dir))
+
+        assert len(find_candidates(str(self.data_dir), ['He'])) == 3
+
+    def test_find_candidates_subdir(self):
+        build_index(str(self.data_dir))
+
+        assert find_candidates(str(Path(self.data_dir, 'subdir')), None) == [
+            str(Path(self.data_dir, 'subdir', 'file3.txt'))
+        ]
+
+    def test_grep_indexed(self, capsys):
+        index(set(), ['build', 'data'])
+        capsys.readouterr()
+        grep({'indexed'}, ['Hello', 'data'])
+        captured = capsys.readouterr()
+
+        assert '1 Hello World' in captured.out
+        assert '1 Hello from subdir' in captured.out
+        assert 'Goodbye' not in captured.out
+
+    def test_grep_indexed_ignore_case(self, capsys):
+        index(set(), ['build', 'data'])
+        capsys.readouterr()
+        grep({'indexed', 'i'}, ['GOODBYE', 'data'])
+        captured = capsys.readouterr()
+
+        assert '1 Goodbye World' in captured.out
+
+    def test_grep_indexed_ignore_case_non_ascii(self, capsys):
+        Path(self.data_dir, 'street.txt').write_text('STRASSE\nÄPFEL\n')
+        index(set(), ['build', 'data'])
+        capsys.readouterr()
+        grep({'indexed', 'i'}, ['straße', 'data'])
+        grep({'indexed', 'i'}, ['äpfel', 'data'])
+        captured = capsys.readouterr()
+
+        assert '1 STRASSE' in captured.out
+        assert '2 ÄPFEL' in captured.out
+
+    def test_grep_indexed_regex(self, capsys):
+        index(set(), ['build', 'data'])
+        capsys.readouterr()
+        grep({'indexed'}, [r'J\w+', 'data'])
+        captured = capsys.readouterr()
+
+        assert '2 Java' in captured.out
+
+    def test_grep_without_index(self):
+        with pytest.raises(src.config.exceptions.IndexNotFound):
+            grep({'indexed'}, ['Hello', 'data'])
+
+    def test_index_without_action(self):
+        with pytest.raises(src.config.exceptions.IncorrectInput):
+            index(set(), [])
+
+    def test_index_with_flag(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            index({'r'}, ['build'])
+
+    def test_index_file_instead_of_directory(self):
+        with pytest.raises(src.config.exceptions.IsNotDirectory):
+            index(set(), ['build', 'data/file1.txt'])
+
+    def test_stale_index_finds_new_and_replaced_files(self, capsys):
+        build_index(str(self.data_dir))
+        time.sleep(0.01)
+        Path(self.data_dir, 'tmp').write_text('Hello World\nzebra\n')
+        os.replace(Path(self.data_dir, 'tmp'), Path(self.data_dir, 'file1.txt'))
+        Path(self.data_dir, 'new', 'deep').mkdir(parents=True)
+        Path(self.data_dir, 'new', 'deep', 'file.txt').write_text('zebra\n')
+        Path(self.data_dir, 'subdir', 'file3.txt').unlink()
+
+        grep({'indexed'}, ['zebra', 'data'])
+        captured = capsys.readouterr()
+
+        assert captured.out.count('zebra') == 2
+        assert 'устарел' in captured.err
+        assert find_candidates(str(self.data_dir), None) == [
+            str(Path(self.data_dir, 'file1.txt')),
+            str(Path(self.data_dir, 'file2.txt')),
+            str(Path(self.data_dir, 'new', 'deep', 'file.txt')),
+        ]
+
+    def test_rescan_finds_files_changed_in_place(self, capsys):
+        build_index(str(self.data_dir))
+        with open(Path(self.data_dir, 'file1.txt'), 'a') as f:
+            f.write('zebra\n')
+
+        grep({'indexed', 'rescan'}, ['zebra', 'data'])
+        captured = capsys.readouterr()
+
+        assert '3 zebra' in captured.out
+        assert 'устарел' in captured.err
+
+    def test_index_trusted_without_rescan(self, capsys, monkeypatch):
+        build_index(str(self.data_dir))
+        stats = []
+        stat = os.stat
+
+        def counting_stat(path, *args, **kwargs):
+            stats.append(str(path))
+            return stat(path, *args, **kwargs)
+
+        monkeypatch.setattr(os, 'stat', counting_stat)
+        candidates = find_candidates(str(self.data_dir), ['Hello'])
+
+        assert len(candidates) == 2
+        assert not [path for path in stats if path.endswith('.txt')]
+        assert str(Path(self.data_dir, 'subdir')) in stats
+
+    def test_fresh_index_no_warning(self, capsys):
+        build_index(str(self.data_dir))
+        candidates = find_candidates(str(self.data_dir), ['Python'])
+        captured = capsys.readouterr()
+
+        assert candidates == [str(Path(self.data_dir, 'file1.txt'))]
+        assert captured.err == ''
+
+    def test_build_index_parallel(self, monkeypatch):
+        monkeypatch.setattr(src.utilities.index, 'INDEX_PARALLEL_MIN', 1)
+        total, updated = build_index(str(self.data_dir))
+
+        assert (total, updated) == (3, 3)
+        assert find_candidates(str(self.data_dir), ['from subdir']) == [
+            str(Path(self.data_dir, 'subdir', 'file3.txt'))
+        ]
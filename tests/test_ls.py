@@ -6,7 +6,8 @@ from pathlib import Path
 import pytest
 
 import src.config.exceptions
-from src.utilities.ls import ls
+import src.utilities.ls
+from src.utilities.ls import ListingCache, ls
 
 
 class TestLsCommand:
@@ -276,3 +277,215 @@ class TestLsCommand:
         captured = capsys.readouterr()
 
         assert all(f'file_{i}.txt' in captured.out for i in range(100))
+
+    def test_ls_l_sorted_by_name(self, capsys):
+        ls({'l'}, [])
+        captured = capsys.readouterr()
+
+        names = [line.split()[0] for line in captured.out.splitlines()]
+        assert names == ['file1.txt', 'file2.py', 'subdir']
+
+    def test_ls_l_broken_symlink(self, capsys):
+        os.symlink('missing', os.path.join(self.test_dir, 'subdir', 'link'))
+
+        ls({'l'}, ['subdir'])
+        captured = capsys.readouterr()
+
+        assert 'link' in captured.out
+        assert 'lrwx' in captured.out
+
+    def test_ls_only_hidden_prints_empty_line(self, capsys):
+        os.mkdir('hidden_only')
+        Path('hidden_only', '.secret').touch()
+
+        ls(set(), ['hidden_only'])
+        captured = capsys.readouterr()
+
+        assert captured.out == '\n'
+
+    def test_ls_recursive(self, capsys):
+        Path(self.test_dir, 'subdir', 'deep').mkdir()
+        Path(self.test_dir, 'subdir', 'deep', 'leaf.txt').touch()
+
+        ls({'R'}, [])
+        captured = capsys.readouterr()
+
+        lines = captured.out.splitlines()
+        root = self.test_dir
+        sub = os.path.join(root, 'subdir')
+        deep = os.path.join(sub, 'deep')
+        assert lines[0] == f'{root}:'
+        assert lines[1] == 'file1.txt file2.py subdir '
+        assert lines[2:] == [
+            f'{sub}:',
+            'deep nested.txt ',
+            f'{deep}:',
+            'leaf.txt ',
+        ]
+
+    def test_ls_recursive_skips_hidden_dirs(self, capsys):
+        Path(self.test_dir, '.cache').mkdir()
+        Path(self.test_dir, '.cache', 'blob').touch()
+
+        ls({'recursive'}, [])
+        captured = capsys.readouterr()
+
+        assert 'blob' not in captured.out
+
+        ls({'R', 'a'}, [])
+        captured = capsys.readouterr()
+
+        assert 'blob' in captured.out
+
+    def test_ls_recursive_does_not_follow_symlinks(self, capsys):
+        os.symlink(self.test_dir, os.path.join(self.test_dir, 'loop'))
+
+        ls({'R', 'l'}, [])
+        captured = capsys.readouterr()
+
+        assert captured.out.count('nested.txt') == 1
+
+    def make_sized_files(self):
+        for name, size, mtime in (
+            ('small', 1, 3000),
+            ('big', 300, 1000),
+            ('medium', 20, 2000),
+        ):
+            path = Path(self.test_dir, 'subdir', name)
+            path.write_text('x' * size)
+            os.utime(path, (mtime, mtime))
+        os.utime(Path(self.test_dir, 'subdir', 'nested.txt'), (0, 0))
+
+    def listed_names(self, capsys):
+        return capsys.readouterr().out.split()
+
+    def test_ls_sort_by_size(self, capsys):
+        self.make_sized_files()
+
+        ls({'S'}, ['subdir'])
+
+        assert self.listed_names(capsys) == [
+            'big',
+            'medium',
+            'small',
+            'nested.txt',
+        ]
+
+    def test_ls_sort_by_time_reverse(self, capsys):
+        self.make_sized_files()
+
+        ls({'t', 'r'}, ['subdir'])
+
+        assert self.listed_names(capsys) == [
+            'nested.txt',
+            'big',
+            'medium',
+            'small',
+        ]
+
+    def test_ls_top(self, capsys):
+        self.make_sized_files()
+
+        ls({'S', 'top=2'}, ['subdir'])
+        assert self.listed_names(capsys) == ['big', 'medium']
+
+        ls({'S', 'r', 'top=2'}, ['subdir'])
+        assert self.listed_names(capsys) == ['nested.txt', 'small']
+
+    def test_ls_top_with_l(self, capsys):
+        self.make_sized_files()
+
+        ls({'l', 'S', 'top=1'}, ['subdir'])
+        captured = capsys.readouterr()
+
+        assert len(captured.out.splitlines()) == 1
+        assert captured.out.startswith('big')
+
+    def test_ls_top_without_value(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            ls({'top'}, ['subdir'])
+
+    def test_ls_top_incorrect_value(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            ls({'top=x'}, ['subdir'])
+
+
+class TestListingCache:
+    """Набор тестов для кэша листингов ls."""
+
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self, monkeypatch):
+        self.test_dir = tempfile.mkdtemp()
+        Path(self.test_dir, 'a.txt').touch()
+        Path(self.test_dir, 'b').mkdir()
+        os.utime(self.test_dir, (1000, 1000))
+
+        self.scans = 0
+        scandir = os.scandir
+
+        def counting_scandir(path):
+            self.scans += 1
+            return scandir(path)
+
+        monkeypatch.setattr(os, 'scandir', counting_scandir)
+
+        yield
+
+        shutil.rmtree(self.test_dir)
+
+    def test_unchanged_directory_is_read_once(self):
+        cache = ListingCache()
+
+        first = cache.get(self.test_dir)
+        second = cache.get(self.test_dir)
+
+        assert sorted(first) == [('a.txt', False), ('b', True)]
+        assert second == first
+        assert self.scans == 1
+
+    def test_changed_directory_is_read_again(self):
+        cache = ListingCache()
+        cache.get(self.test_dir)
+
+        Path(self.test_dir, 'c.txt').touch()
+        os.utime(self.test_dir, (2000, 2000))
+        names = cache.get(self.test_dir)
+
+        assert ('c.txt', False) in names
+        assert self.scans == 2
+        assert cache.count == 3
+
+    def test_recent_directory_is_not_cached(self):
+        cache = ListingCache()
+        os.utime(self.test_dir)
+
+        cache.get(self.test_dir)
+        cache.get(self.test_dir)
+
+        assert self.scans == 2
+        assert not cache.listings
+
+    def test_lru_eviction_by_entry_count(self):
+        other = os.path.join(self.test_dir, 'b')
+        Path(other, 'x').touch()
+        os.utime(other, (1000, 1000))
+        cache = ListingCache(size=2)
+
+        cache.get(self.test_dir)
+        cache.get(other)
+
+        assert list(cache.listings) == [other]
+        assert cache.count == 1
+
+    def test_ls_l_sees_new_file_size(self, capsys, monkeypatch):
+        monkeypatch.setattr(src.utilities.ls, 'listing_cache', ListingCache())
+        ls({'l'}, [self.test_dir])
+        capsys.readouterr()
+
+        Path(self.test_dir, 'a.txt').write_text('x' * 12345)
+        os.utime(self.test_dir, (1000, 1000))
+        ls({'l'}, [self.test_dir])
+        captured = capsys.readouterr()
+
+        assert '12345' in captured.out
+        assert self.scans == 1
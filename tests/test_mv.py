@@ -1,12 +1,14 @@
 import os
 import shutil
+import sys
 import tempfile
 from pathlib import Path
 
 import pytest
 
 import src.config.exceptions
-from src.utilities.mv import mv
+from src.config.progress import Progress
+from src.utilities.mv import add_move_total, mv
 
 
 class TestMvCommand:
@@ -125,6 +127,43 @@ class TestMvCommand:
         with pytest.raises(src.config.exceptions.IncorrectFlag):
             mv({'f'}, ['file1.txt', 'renamed.txt'])
 
+    def test_mv_no_progress_flag(self):
+        mv({'no-progress'}, ['file1.txt', 'renamed.txt'])
+
+        assert Path(self.test_dir, 'renamed.txt').read_text() == 'Content 1'
+
+    def test_mv_copy_reports_progress(self, monkeypatch, terminal):
+        def cross_device(src, dst):
+            raise OSError('Invalid cross-device link')
+
+        monkeypatch.setattr(sys, 'stderr', terminal)
+        monkeypatch.setattr(os, 'rename', cross_device)
+        mv(set(), ['subdir1', 'subdir2'])
+
+        moved = Path(self.test_dir, 'subdir2', 'subdir1', 'nested.txt')
+        assert moved.read_text() == 'Nested'
+        assert not Path(self.test_dir, 'subdir1').exists()
+        assert 'файлов 1' in terminal.getvalue()
+
+    def test_move_total_counts_links_as_links(self, terminal):
+        if os.stat('/dev').st_dev == os.stat(self.test_dir).st_dev:
+            pytest.skip('нужна другая файловая система')
+        Path(self.test_dir, 'big.bin').write_bytes(b'x' * 1000)
+        Path(self.test_dir, 'subdir1', 'link').symlink_to('../big.bin')
+        Path(self.test_dir, 'link.txt').symlink_to('big.bin')
+        progress = Progress(set(), terminal)
+
+        add_move_total(progress, os.path.abspath('subdir1'), '/dev/subdir1')
+        add_move_total(progress, os.path.abspath('link.txt'), '/dev/link')
+
+        assert (progress.total_bytes, progress.total_files) == (6, 1)
+
+    def test_mv_same_filesystem_no_progress_line(self, monkeypatch, terminal):
+        monkeypatch.setattr(sys, 'stderr', terminal)
+        mv(set(), ['file1.txt', 'renamed.txt'])
+
+        assert terminal.getvalue() == ''
+
     def test_mv_without_arguments(self):
         with pytest.raises(src.config.exceptions.IncorrectInput):
             mv(set(), [])
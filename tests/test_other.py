@@ -1,9 +1,14 @@
+import io
+import os
 import pytest
 from pathlib import Path
 import src.config.functions
 import src.config.exceptions
 import src.config.utilities
 import src.config.list_of_ut
+import src.config.output
+import src.config.progress
+import src.main
 
 def test_incorrect_command():
     with pytest.raises(src.config.exceptions.IncorrectCommand):
@@ -44,3 +49,158 @@ def test_init_env():
     assert Path(src.config.consts.TRASH_PATH).exists()
     assert Path(src.config.consts.HISTORY_PATH).exists()
     assert not any(Path(src.config.consts.TRASH_PATH).iterdir())
+
+def test_tokenize_many_flags():
+    command, flag, paths = src.config.functions.tokenize('grep -ri --jobs=4 Hello src')
+
+    assert command == 'grep'
+    assert flag == {'r', 'i', 'jobs=4'}
+    assert paths == ['Hello', 'src']
+
+def test_tokenize_short_flag_value():
+    command, flag, paths = src.config.functions.tokenize('grep -rj=2 Hello src')
+
+    assert flag == {'r', 'j=2'}
+    assert paths == ['Hello', 'src']
+
+def test_tokenize_end_of_flags():
+    command, flag, paths = src.config.functions.tokenize('grep -r -- -x src')
+
+    assert flag == {'r'}
+    assert paths == ['-x', 'src']
+
+def test_walk_files(tmp_path):
+    Path(tmp_path, 'a.txt').touch()
+    deep = Path(tmp_path, 'x', 'y', 'z')
+    deep.mkdir(parents=True)
+    Path(deep, 'b.txt').touch()
+    Path(tmp_path, '.git').mkdir()
+    Path(tmp_path, '.git', 'HEAD').touch()
+
+    files = set(src.config.functions.walk_files(str(tmp_path), ['.git']))
+
+    assert files == {str(Path(tmp_path, 'a.txt')), str(Path(deep, 'b.txt'))}
+
+def test_walk_files_deep_tree(tmp_path):
+    path = tmp_path
+    for _ in range(200):
+        path = path / 'd'
+    path.mkdir(parents=True)
+    Path(path, 'leaf.txt').touch()
+
+    assert list(src.config.functions.walk_files(str(tmp_path))) == [
+        str(Path(path, 'leaf.txt'))
+    ]
+
+def test_walk_files_follows_directory_symlinks(tmp_path):
+    Path(tmp_path, 'd').mkdir()
+    Path(tmp_path, 'd', 'a.txt').touch()
+    Path(tmp_path, 'e').mkdir()
+    Path(tmp_path, 'e', 'link').symlink_to(Path('..', 'd'))
+    Path(tmp_path, 'e', 'link', 'loop').symlink_to(Path('..'))
+    Path(tmp_path, 'dangling').symlink_to('missing')
+    os.mkfifo(Path(tmp_path, 'fifo'))
+
+    files = set(src.config.functions.walk_files(str(tmp_path)))
+
+    assert files == {
+        str(Path(tmp_path, 'd', 'a.txt')),
+        str(Path(tmp_path, 'e', 'link', 'a.txt')),
+    }
+
+def test_scan_tree(tmp_path):
+    Path(tmp_path, 'sub').mkdir()
+    Path(tmp_path, 'sub', 'a.txt').touch()
+
+    tree = {
+        path: sorted(e.name for e in entries)
+        for path, entries in src.config.functions.scan_tree(str(tmp_path))
+    }
+
+    assert tree == {str(tmp_path): ['sub'], str(Path(tmp_path, 'sub')): ['a.txt']}
+
+def test_output_block_buffered():
+    stream = io.StringIO()
+    with src.config.output.Output(stream, size=10, interval=60) as out:
+        out.write('abc\n')
+        assert stream.getvalue() == ''
+        out.write('defghij\n')
+        assert stream.getvalue() == 'abc\ndefghij\n'
+        out.write('tail\n')
+    assert stream.getvalue() == 'abc\ndefghij\ntail\n'
+
+def test_output_tty_is_line_buffered(terminal):
+    out = src.config.output.Output(terminal)
+    out.write('line\n')
+
+    assert out.line_buffered
+    assert terminal.getvalue() == 'line\n'
+
+
+def test_human_size_bytes():
+    assert src.config.functions.human_size(512) == '512'
+
+def test_human_size_units():
+    assert src.config.functions.human_size(1536) == '1.5K'
+    assert src.config.functions.human_size(20 * 1024 * 1024) == '20M'
+    assert src.config.functions.human_size(3 * 1024**3) == '3.0G'
+
+
+def test_progress_disabled_without_tty():
+    stream = io.StringIO()
+    with src.config.progress.Progress(set(), stream) as progress:
+        progress.add_total(100)
+        progress.update(100)
+
+    assert not progress.enabled
+    assert progress.callback is None
+    assert stream.getvalue() == ''
+
+def test_progress_disabled_by_flag(terminal):
+    progress = src.config.progress.Progress({'no-progress'}, terminal)
+
+    assert not progress.enabled
+    assert progress.callback is None
+
+def test_progress_counts_and_draws(terminal):
+    with src.config.progress.Progress(set(), terminal, interval=0) as progress:
+        progress.add_total(2048, files=2)
+        progress.callback(1024)
+        progress.file_done()
+        progress.update(1024)
+        progress.file_done()
+
+    assert progress.done_bytes == 2048
+    assert progress.done_files == 2
+    last = terminal.getvalue().split('\r')[-1]
+    assert last.startswith('2.0K/2.0K, файлов 2/2')
+    assert last.endswith('\n')
+
+def test_progress_close_silent_when_nothing_counted(terminal):
+    with src.config.progress.Progress(set(), terminal):
+        pass
+
+    assert terminal.getvalue() == ''
+
+def test_progress_throttled(terminal):
+    progress = src.config.progress.Progress(set(), terminal, interval=60)
+    for _ in range(100):
+        progress.update(1)
+
+    assert terminal.getvalue() == ''
+    progress.close()
+    assert terminal.getvalue().count('\r') == 1
+
+
+def test_grep_quiet_exit_status(tmp_path, capsys):
+    path = str(tmp_path / 'file.txt')
+    Path(path).write_text('Hello World\n')
+
+    assert src.main.execute('grep', {'q'}, ['Hello', path]) == 0
+    assert src.main.execute('grep', {'q'}, ['NotFound', path]) == 1
+    assert src.main.execute('grep', set(), ['NotFound', path]) == 0
+    assert capsys.readouterr().out == ''
+
+def test_prompt_shows_exit_status():
+    assert src.main.prompt('~/dir', 1) == '[1] ~/dir$ '
+    assert src.main.prompt('~/dir', 0) == '~/dir$ '
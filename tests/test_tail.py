@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import src.config.exceptions
+import src.utilities.tail
+from src.utilities.tail import tail
+
+
+class TestTailCommand:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+
+        lines = ''.join(f'line {i}\n' for i in range(1, 31))
+        Path(self.test_dir, 'long.txt').write_text(lines)
+        Path(self.test_dir, 'short.txt').write_text('one\ntwo')
+        Path(self.test_dir, 'empty.txt').touch()
+        Path(self.test_dir, 'subdir').mkdir()
+
+        yield
+
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+
+    def test_tail_default_lines(self, capsys):
+        tail(set(), ['long.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == ''.join(f'line {i}\n' for i in range(21, 31))
+
+    def test_tail_n(self, capsys):
+        tail({'n=2'}, ['long.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == 'line 29\nline 30\n'
+
+    def test_tail_lines_across_blocks(self, capsys, monkeypatch):
+        monkeypatch.setattr(src.utilities.tail, 'CHUNK_SIZE', 4)
+
+        tail({'lines=3'}, ['long.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == 'line 28\nline 29\nline 30\n'
+
+    def test_tail_reads_only_end(self, monkeypatch):
+        monkeypatch.setattr(src.utilities.tail, 'CHUNK_SIZE', 16)
+        with open('long.txt', 'rb') as f:
+            reads = []
+            read = f.read
+
+            def counting_read(size=-1):
+                reads.append(size)
+                return read(size)
+
+            f.read = counting_read
+            start = src.utilities.tail.find_tail_start(f, 1)
+
+        assert start == os.path.getsize('long.txt') - len('line 30\n')
+        assert sum(reads) <= 17
+
+    def test_tail_without_trailing_newline(self, capsys):
+        tail({'n=1'}, ['short.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == 'two\n'
+
+    def test_tail_more_than_file(self, capsys):
+        tail({'n=5'}, ['short.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == 'one\ntwo\n'
+
+    def test_tail_zero_and_empty(self, capsys):
+        tail({'n=0'}, ['long.txt'])
+        tail(set(), ['empty.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == ''
+
+    def test_tail_follow(self, capsys, monkeypatch):
+        calls = []
+
+        def fake_sleep(seconds):
+            calls.append(seconds)
+            if len(calls) == 1:
+                with open('long.txt', 'a') as f:
+                    f.write('line 31\n')
+            else:
+                raise KeyboardInterrupt
+
+        monkeypatch.setattr(src.utilities.tail.time, 'sleep', fake_sleep)
+
+        tail({'f', 'n=1'}, ['long.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out == 'line 30\nline 31\n'
+
+    def test_tail_follow_several_files(self):
+        with pytest.raises(src.config.exceptions.IncorrectInput):
+            tail({'f'}, ['long.txt', 'short.txt'])
+
+    def test_tail_n_without_value(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            tail({'n'}, ['long.txt'])
+
+    def test_tail_incorrect_flag(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            tail({'x'}, ['long.txt'])
+
+    def test_tail_dir(self):
+        with pytest.raises(src.config.exceptions.IsNotFile):
+            tail(set(), ['subdir'])
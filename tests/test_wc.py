@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import src.config.exceptions
+import src.utilities.wc
+from src.utilities.wc import count_file, wc
+
+
+class TestWcCommand:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+
+        Path(self.test_dir, 'text.txt').write_text(
+            'Hello World\n  spaced   words here \nlast line'
+        )
+        Path(self.test_dir, 'two.txt').write_text('a b\nc\n')
+        Path(self.test_dir, 'empty.txt').touch()
+        Path(self.test_dir, 'subdir').mkdir()
+
+        yield
+
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+
+    def test_wc_all_counters(self, capsys):
+        wc(set(), ['text.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out.split() == ['2', '7', '44', 'text.txt']
+
+    def test_wc_lines(self, capsys):
+        wc({'l'}, ['text.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out.split() == ['2', 'text.txt']
+
+    def test_wc_words_and_bytes(self, capsys):
+        wc({'words', 'c'}, ['two.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out.split() == ['3', '6', 'two.txt']
+
+    def test_wc_total(self, capsys):
+        wc({'l'}, ['text.txt', 'two.txt', 'empty.txt'])
+        lines = capsys.readouterr().out.splitlines()
+
+        assert [line.split() for line in lines] == [
+            ['2', 'text.txt'],
+            ['2', 'two.txt'],
+            ['0', 'empty.txt'],
+            ['4', 'итого'],
+        ]
+
+    @pytest.mark.parametrize('size', [1, 2, 3, 5, 7])
+    def test_wc_words_across_blocks(self, monkeypatch, size):
+        monkeypatch.setattr(src.utilities.wc, 'WC_CHUNK_SIZE', size)
+
+        assert count_file('text.txt', True) == (2, 7, 44)
+
+    def test_wc_bytes_without_reading(self, capsys, monkeypatch):
+        def fail(*args):
+            raise AssertionError('file was read')
+
+        monkeypatch.setattr(src.utilities.wc, 'count_file', fail)
+
+        wc({'c'}, ['text.txt'])
+        captured = capsys.readouterr()
+
+        assert captured.out.split() == ['44', 'text.txt']
+
+    def test_wc_empty_paths(self):
+        with pytest.raises(src.config.exceptions.IncorrectInput):
+            wc(set(), [])
+
+    def test_wc_incorrect_flag(self):
+        with pytest.raises(src.config.exceptions.IncorrectFlag):
+            wc({'x'}, ['text.txt'])
+
+    def test_wc_nonexistent_file(self):
+        with pytest.raises(src.config.exceptions.PathError):
+            wc(set(), ['text.txt', 'missing.txt'])
+
+    def test_wc_dir(self):
+        with pytest.raises(src.config.exceptions.IsNotFile):
+            wc(set(), ['subdir'])